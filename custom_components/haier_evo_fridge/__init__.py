@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity import Entity, EntityCategory
 from homeassistant.loader import async_get_integration
-from .logger import _LOGGER
+from .core.api import HaierFridge
+from .core.logger import _LOGGER
+from .core.profile import EntityDescriptor
 from .const import DOMAIN
-from . import api
+from . import hub
+from . import services
 
-__all__ = ['HaierFridgeEntity']
+__all__ = ['HaierFridgeEntity', 'HaierFridgeAttributeEntity']
 
 
 PLATFORMS: list[str] = ["binary_sensor", "number", "sensor", "switch"]
@@ -17,12 +21,21 @@ PLATFORMS: list[str] = ["binary_sensor", "number", "sensor", "switch"]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     integration = await async_get_integration(hass, DOMAIN)
-    _LOGGER.debug(f'Integration version: {integration.version}')
-    haier_object = api.Haier(hass, entry.data["email"], entry.data["password"])
+    _LOGGER.debug("Integration version: %s", integration.version)
+    haier_object = await hub.async_acquire(hass, entry)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = haier_object
-    await hass.async_add_executor_job(haier_object.load_tokens)
-    await hass.async_add_executor_job(haier_object.pull_data)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await services.async_register_services(hass)
+
+    async def _async_stop(event: Event) -> None:
+        await hub.async_release(hass, entry)
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop))
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await hub.async_release(hass, entry)
+        raise
     return True
 
 
@@ -30,15 +43,33 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await hub.async_release(hass, entry)
+        if entry.disabled_by is not None:
+            hub.async_pass_ownership(hass, entry)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    hub.async_pass_ownership(hass, entry)
+
+
 class HaierFridgeEntity(Entity):
     """Base class for Haier Evo Fridge entities."""
 
-    def __init__(self, device) -> None:
-        """Initialize the entity."""
+    # state is pushed through the device listeners, while the websocket is
+    # down the client polls the cloud itself within its rate limit
+    _attr_should_poll = False
+
+    def __init__(self, device: HaierFridge, descriptor) -> None:
+        """Initialize the entity from its descriptor."""
         self._device = device
+        self._descriptor = descriptor
+        self._attr_name = descriptor.name
+        self._attr_unique_id = f"{device.unique_id}_{descriptor.key}"
+        if descriptor.category is not None:
+            self._attr_entity_category = EntityCategory(descriptor.category)
+        if descriptor.icon is not None:
+            self._attr_icon = descriptor.icon
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -51,6 +82,10 @@ class HaierFridgeEntity(Entity):
             sw_version=self._device.sw_version,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Write state whenever the device reports a change."""
+        self.async_on_remove(self._device.add_listener(self.schedule_update_ha_state))
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
@@ -59,3 +94,12 @@ class HaierFridgeEntity(Entity):
     async def async_update(self) -> None:
         """Update the entity."""
         await self._device.update()
+
+
+class HaierFridgeAttributeEntity(HaierFridgeEntity):
+    """Entity bound to one attribute of the device profile."""
+
+    def __init__(self, device: HaierFridge, descriptor: EntityDescriptor) -> None:
+        """Initialize the entity from its profile descriptor."""
+        super().__init__(device, descriptor)
+        self._attribute_id = descriptor.attribute.id
@@ -1,4 +1,4 @@
-"""Support for Haier Evo Fridge door sensors."""
+"""Support for Haier Evo Fridge binary sensors."""
 from __future__ import annotations
 
 from homeassistant.components.binary_sensor import (
@@ -7,11 +7,9 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HaierFridgeEntity
-from .const import DOMAIN
+from . import HaierFridgeAttributeEntity, hub
 
 
 async def async_setup_entry(
@@ -20,28 +18,23 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Haier Evo Fridge binary sensor platform."""
-    device = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        HaierFridgeBinarySensor(device, descriptor)
+        for device in hub.owned_devices(hass, config_entry)
+        for descriptor in device.profile.entities_for("binary_sensor")
+    )
 
-    entities = [
-        HaierFridgeDoorSensor(device),
-    ]
 
-    async_add_entities(entities)
+class HaierFridgeBinarySensor(HaierFridgeAttributeEntity, BinarySensorEntity):
+    """Haier Evo Fridge binary sensor described by the device profile."""
 
-
-class HaierFridgeDoorSensor(HaierFridgeEntity, BinarySensorEntity):
-    """Haier Evo Fridge door sensor."""
-
-    _attr_device_class = BinarySensorDeviceClass.DOOR
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, device) -> None:
+    def __init__(self, device, descriptor) -> None:
         """Initialize the sensor."""
-        super().__init__(device)
-        self._attr_name = "Door"
-        self._attr_unique_id = f"{self._device.unique_id}_door"
+        super().__init__(device, descriptor)
+        if descriptor.device_class is not None:
+            self._attr_device_class = BinarySensorDeviceClass(descriptor.device_class)
 
     @property
     def is_on(self) -> bool | None:
-        """Return true if door is open."""
-        return self._device.door_open
+        """Return true if the binary sensor is on."""
+        return self._device.values.get(self._attribute_id)
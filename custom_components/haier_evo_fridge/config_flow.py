@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import voluptuous as vol
 from typing import Any
+from requests.exceptions import RequestException
+from tenacity import RetryError
 from homeassistant import config_entries, exceptions
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
-from .logger import _LOGGER
+from .core import api
+from .core.logger import _LOGGER
+from . import hub
 
 
 DATA_SCHEMA = vol.Schema({"email": str, "password": str})
@@ -16,6 +20,20 @@ async def validate_input(hass: HomeAssistant, data: dict) -> dict[str, Any]:
         raise InvalidEmail
     if len(data["password"]) < 3:
         raise InvalidPassword
+    # log in with the password, not a saved token, and discover once;
+    # the entry created from this flow takes the connection over
+    haier = api.Haier(data["email"], data["password"], hass.config.path())
+    try:
+        await haier.executor.async_run(haier.pull_data, False)
+    except Exception as e:
+        await haier.executor.async_run(haier.close)
+        if isinstance(e, (api.InvalidDevicesList, RequestException, RetryError)):
+            raise CannotConnect from e
+        raise
+    if not haier.devices:
+        await haier.executor.async_run(haier.close)
+        raise CannotConnect
+    hub.async_hand_off(hass, haier)
     return {"title": data["email"]}
 
 
@@ -33,6 +51,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["email"] = "invalid_email"
             except InvalidPassword:
                 errors["password"] = "invalid_password"
+            except api.InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -49,3 +71,7 @@ class InvalidEmail(exceptions.HomeAssistantError):
 
 class InvalidPassword(exceptions.HomeAssistantError):
     """Error to indicate there is an invalid hostname."""
+
+
+class CannotConnect(exceptions.HomeAssistantError):
+    """Error to indicate the cloud could not be reached."""
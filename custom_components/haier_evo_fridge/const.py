@@ -1,26 +1,13 @@
-DOMAIN = "haier_evo_fridge"
-CALLS = 5
-RATE_LIMIT = 60
-API_TIMEOUT = 15
-API_PATH = "https://evo.haieronline.ru"
-API_LOGIN = "v1/users/auth/sign-in"
-API_TOKEN_REFRESH = "v1/users/auth/refresh"
-API_DEVICES = "v2/ru/pages/sduiRawPaginated/smartHome?part=1&partitionWeight=6"
-API_STATUS = "https://iot-platform.evo.haieronline.ru/mobile-backend-service/api/v1/config/{mac}?type=DETAILED"
-API_WS_PATH = "wss://iot-platform.evo.haieronline.ru/gateway-ws-service/ws/"
+from .core.const import *  # noqa: F401,F403
+from .core.const import DOMAIN
 
-# Fridge attributes
-ATTR_FRIDGE_DOOR = "10"  # Door state sensor
-ATTR_AMBIENT_TEMP = "2"  # Ambient temperature
-ATTR_FREEZER_TEMP = "1"  # Freezer temperature
-ATTR_FRIDGE_TEMP = "3"   # Fridge temperature control
-ATTR_FREEZER_CONTROL = "4"  # Freezer temperature control
-ATTR_VACATION_MODE = "8"  # Vacation mode
-ATTR_SUPER_COOL = "6"    # Super cooling mode
-ATTR_SUPER_FREEZE = "7"  # Super freeze mode
+DATA_HUBS = f"{DOMAIN}_hubs"
+DATA_HUBS_LOCK = f"{DOMAIN}_hubs_lock"
+DATA_HANDOFF = f"{DOMAIN}_handoff"
+HANDOFF_TIMEOUT = 5 * 60  # seconds a config flow connection waits for its entry
 
-# Temperature ranges
-MIN_FRIDGE_TEMP = 1
-MAX_FRIDGE_TEMP = 9
-MIN_FREEZER_TEMP = -24
-MAX_FREEZER_TEMP = -16
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_SET_ATTRIBUTES = "set_attributes"
+
+EVENT_THERMAL_ANOMALY = f"{DOMAIN}_thermal_anomaly"
@@ -0,0 +1,7 @@
+"""
+Haier Evo client independent of Home Assistant.
+"""
+
+from .api import Haier, HaierError, HaierFridge, InvalidAuth, InvalidDevicesList, SocketStatus
+
+__all__ = ['Haier', 'HaierError', 'HaierFridge', 'InvalidAuth', 'InvalidDevicesList', 'SocketStatus']
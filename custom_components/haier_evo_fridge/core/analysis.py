@@ -0,0 +1,173 @@
+"""
+Thermal analysis over windowed temperature history.
+
+Every device keeps a change log of its fridge and freezer temperatures and
+setpoints. `analyze` resamples the logs of all devices onto one time grid
+and evaluates them together as a matrix with one row per compartment: rate
+of rise, compressor cycle period and deviation from the setpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from . import const as C # noqa
+
+# compartments analysed, in row order within a device
+COMPARTMENTS = ("fridge", "freezer")
+
+
+class TemperatureHistory(object):
+    """Change log of temperatures and setpoints covering the analysis window."""
+
+    def __init__(self, window: float = C.ANALYSIS_WINDOW, size: int = C.ANALYSIS_HISTORY_SIZE) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        # (time, fridge, freezer, fridge setpoint, freezer setpoint)
+        self._samples: deque[tuple] = deque(maxlen=size)
+
+    def record(
+        self,
+        t: float,
+        fridge: float | None,
+        freezer: float | None,
+        fridge_target: float | None,
+        freezer_target: float | None,
+    ) -> None:
+        values = (fridge, freezer, fridge_target, freezer_target)
+        with self._lock:
+            if self._samples and self._samples[-1][1:] == values:
+                return
+            self._samples.append((t, *values))
+            # the newest sample older than the window holds the value at the window start
+            while len(self._samples) > 1 and self._samples[1][0] <= t - self._window:
+                self._samples.popleft()
+
+    def snapshot(self) -> list[tuple]:
+        with self._lock:
+            return list(self._samples)
+
+
+@dataclass(frozen=True)
+class ThermalState:
+    """Analysis results of one device, None where the history is too short."""
+
+    fridge_rise_rate: float | None = None  # °C per hour
+    freezer_rise_rate: float | None = None
+    fridge_cycle_period: float | None = None  # minutes
+    freezer_cycle_period: float | None = None
+    fridge_deviation: float | None = None  # °C above the setpoint
+    freezer_deviation: float | None = None
+    anomalies: frozenset[str] = field(default_factory=frozenset)
+
+    def as_dict(self) -> dict[str, float | None]:
+        """Numeric results by name."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "anomalies"}
+
+    @property
+    def compressor_cycle_period(self) -> float | None:
+        """Cycle period of the freezer, which follows the compressor most closely."""
+        if self.freezer_cycle_period is not None:
+            return self.freezer_cycle_period
+        return self.fridge_cycle_period
+
+
+def _resample(histories: list[TemperatureHistory], grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Hold every logged value until the next change, one row per device compartment."""
+    temperatures = np.full((len(histories), len(COMPARTMENTS), len(grid)), np.nan)
+    setpoints = np.full_like(temperatures, np.nan)
+    for i, history in enumerate(histories):
+        samples = history.snapshot()
+        if not samples:
+            continue
+        data = np.array(samples, dtype=float)  # None becomes nan
+        index = np.searchsorted(data[:, 0], grid, side="right") - 1
+        held = data[np.maximum(index, 0), 1:]
+        held[index < 0] = np.nan
+        temperatures[i] = held[:, 0:2].T
+        setpoints[i] = held[:, 2:4].T
+    return temperatures.reshape(-1, len(grid)), setpoints.reshape(-1, len(grid))
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    count = mask.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(mask, values, 0.0).sum(axis=1) / count
+    mean[count == 0] = np.nan
+    return mean
+
+
+def _rise_rate(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Least squares slope of every row in units of y per hour."""
+    n = mask.sum(axis=1)
+    xm = np.where(mask, x, 0.0)
+    ym = np.where(mask, y, 0.0)
+    sx, sy = xm.sum(axis=1), ym.sum(axis=1)
+    denominator = n * (xm * xm).sum(axis=1) - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * (xm * ym).sum(axis=1) - sx * sy) / denominator * 3600
+    # a fit over less than half of the range says little about the trend
+    slope[(n < mask.shape[1] / 2) | (denominator <= 0)] = np.nan
+    return slope
+
+
+def _cycle_period(temperatures: np.ndarray, valid: np.ndarray, step: float) -> np.ndarray:
+    """Mean spacing in minutes of upward crossings of every row's mean."""
+    above = temperatures > _masked_mean(temperatures, valid)[:, None]
+    crossings = ~above[:, :-1] & above[:, 1:] & valid[:, :-1] & valid[:, 1:]
+    count = crossings.sum(axis=1)
+    first = crossings.argmax(axis=1)
+    last = crossings.shape[1] - 1 - crossings[:, ::-1].argmax(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        period = (last - first) / (count - 1) * step / 60
+    period[count < 2] = np.nan
+    return period
+
+
+def _value(array: np.ndarray, index: int) -> float | None:
+    value = array[index]
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def analyze(
+    histories: list[TemperatureHistory],
+    door_open: list[bool],
+    now: float,
+    window: float = C.ANALYSIS_WINDOW,
+    step: float = C.ANALYSIS_STEP,
+    rise_window: float = C.ANALYSIS_RISE_WINDOW,
+) -> list[ThermalState]:
+    """Analyse the histories of several devices in one pass."""
+    if not histories:
+        return []
+    points = int(window // step)
+    grid = now - step * np.arange(points - 1, -1, -1)
+    temperatures, setpoints = _resample(histories, grid)
+    valid = ~np.isnan(temperatures)
+
+    recent = slice(points - max(int(rise_window // step), 2), None)
+    rise_rate = _rise_rate(grid[recent] - now, temperatures[:, recent], valid[:, recent])
+    deviation_values = temperatures[:, recent] - setpoints[:, recent]
+    deviation = _masked_mean(deviation_values, ~np.isnan(deviation_values))
+    cycle_period = _cycle_period(temperatures, valid, step)
+
+    results = []
+    for i, door in enumerate(door_open):
+        values = {}
+        anomalies = set()
+        for j, compartment in enumerate(COMPARTMENTS):
+            row = i * len(COMPARTMENTS) + j
+            values[f"{compartment}_rise_rate"] = rate = _value(rise_rate, row)
+            values[f"{compartment}_cycle_period"] = _value(cycle_period, row)
+            values[f"{compartment}_deviation"] = offset = _value(deviation, row)
+            # warming with the door open is expected
+            if rate is not None and rate > C.ANALYSIS_RISE_ALERT and not door:
+                anomalies.add(f"{compartment}_warming")
+            if offset is not None and abs(offset) > C.ANALYSIS_DEVIATION_ALERT:
+                anomalies.add(f"{compartment}_deviation")
+        results.append(ThermalState(**values, anomalies=frozenset(anomalies)))
+    return results
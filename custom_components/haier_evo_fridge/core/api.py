@@ -0,0 +1,1058 @@
+from __future__ import annotations
+import logging
+import hashlib
+import os
+import requests
+import json
+import time
+import threading
+import uuid
+import socket
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from enum import Enum
+from typing import Any, Callable, Hashable, Mapping
+from datetime import datetime, timezone, timedelta
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from ratelimit import limits, sleep_and_retry
+from websocket import WebSocketConnectionClosedException, WebSocketException, WebSocketApp, WebSocket
+from requests.exceptions import ConnectionError, Timeout, HTTPError
+from urllib.parse import urlparse, urljoin, parse_qs
+from urllib3.exceptions import NewConnectionError
+from .logger import _LOGGER
+from . import analysis
+from . import capture
+from .commands import CommandBatch
+from .executor import HaierExecutor
+from .singleflight import SingleFlight
+from .traffic import UNKNOWN_DEVICE, TrafficCounters
+from .profile import DeviceProfile, get_profile
+from . import const as C # noqa
+
+
+class HaierError(Exception):
+    """Base error of the Haier Evo client."""
+
+
+class InvalidAuth(HaierError):
+    """Error to indicate we cannot connect."""
+
+
+class InvalidDevicesList(HaierError):
+    """Error to indicate we cannot connect."""
+
+
+def account_id(email: str) -> str:
+    return email.strip().lower()
+
+
+class SocketStatus(Enum):
+    PRE_INITIALIZATION = 0
+    INITIALIZING = 1
+    INITIALIZED = 2
+    NOT_INITIALIZED = 3
+
+
+class Haier(object):
+
+    def __init__(self, email: str, password: str, storage_dir: str) -> None:
+        self.storage_dir = storage_dir
+        self.devices: list[HaierFridge] = []
+        self._devices_by_id: dict[str, HaierFridge] = {}
+        self._email: str = email
+        self._password: str = password
+        self._lock = threading.Lock()
+        self._devices_lock = threading.Lock()
+        self._pending_devices: set[str] = set()
+        self._queue_lock = threading.Lock()
+        # device id -> command name -> (queued at, payload, trace)
+        self._command_queues: dict[str, OrderedDict[str, tuple[float, str, str | None]]] = {}
+        # command trace -> batch waiting for its acknowledgement
+        self._pending_acks: dict[str, CommandBatch] = {}
+        self._token: str | None = None
+        self._tokenexpire: datetime | None = None
+        self._refreshtoken: str | None = None
+        self._refreshexpire: datetime | None = None
+        self._socket_app = None
+        # guards _socket_app against close() running while a socket thread authenticates
+        self._socket_lock = threading.Lock()
+        self._socket_threads: list[threading.Thread] = []
+        self._disconnect_requested = False
+        self._socket_status: SocketStatus = SocketStatus.PRE_INITIALIZATION
+        self._connected = threading.Event()
+        # set on disconnect, wakes a reconnect waiting out its backoff
+        self._reconnect_wake = threading.Event()
+        self._reconnect_delay: float = C.RECONNECT_DELAY_MIN
+        self._recorder: capture.TrafficRecorder | None = None
+        self.traffic = TrafficCounters()
+        self._single_flight = SingleFlight(C.REQUEST_CACHE_TTL)
+        self.executor = HaierExecutor()
+        self._poll_lock = threading.Lock()
+        # stopped poll threads stay listed until they exit, close() joins them
+        self._poll_threads: list[threading.Thread] = []
+        self._poll_stop = threading.Event()
+        self._poll_due: dict[str, float] = {}
+        self._poll_intervals: dict[str, float] = {}
+
+    @property
+    def token(self) -> str | None:
+        return self._token
+
+    @property
+    def socket_status(self) -> SocketStatus:
+        return self._socket_status
+
+    @property
+    def account_id(self) -> str:
+        return account_id(self._email)
+
+    @property
+    def _account_digest(self) -> str:
+        return hashlib.sha256(self.account_id.encode()).hexdigest()[:16]
+
+    @property
+    def tokens_path(self) -> str:
+        """Per-account tokens file, accounts must not overwrite each other's tokens."""
+        return os.path.join(self.storage_dir, f"{C.DOMAIN}_{self._account_digest}")
+
+    @property
+    def capture_path(self) -> str:
+        return os.path.join(self.storage_dir, f"{C.DOMAIN}_capture_{self._account_digest}.jsonl.gz")
+
+    def start_capture(self, path: str | None = None) -> str:
+        """Record websocket traffic to a capture file, return its path."""
+        self.stop_capture()
+        self._recorder = capture.TrafficRecorder(path or self.capture_path)
+        _LOGGER.info("Capturing websocket traffic to %s", self._recorder.path)
+        return self._recorder.path
+
+    def stop_capture(self) -> None:
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    @property
+    def load_tokens(self):
+        return self._load_tokens
+
+    def _load_tokens(self) -> None:
+        try:
+            filename = self.tokens_path
+            with open(filename, "r") as f:
+                data = json.load(f)
+            assert isinstance(data, dict), "Bad saved tokens file"
+            self._token = data.get("token", None)
+            tokenexpire = data.get("tokenexpire")
+            self._tokenexpire = datetime.fromisoformat(tokenexpire) if tokenexpire else None
+            self._refreshtoken = data.get("refreshtoken", None)
+            refreshexpire = data.get("refreshexpire")
+            self._refreshexpire = datetime.fromisoformat(refreshexpire) if refreshexpire else None
+        except Exception as e:
+            _LOGGER.error("Failed to load tokens file: %s", e)
+        else:
+            _LOGGER.info("Loaded tokens file: %s", filename)
+
+    def _save_tokens(self) -> None:
+        try:
+            filename = self.tokens_path
+            with open(filename, "w") as f:
+                json.dump({
+                    "token": self._token,
+                    "tokenexpire": str(self._tokenexpire) if self._tokenexpire else None,
+                    "refreshtoken": self._refreshtoken,
+                    "refreshexpire": str(self._refreshexpire) if self._refreshexpire else None,
+                }, f)
+        except Exception as e:
+            _LOGGER.error("Failed to save tokens file: %s", e)
+        else:
+            _LOGGER.debug("Saved tokens file: %s", filename)
+
+    def _clear_tokens(self) -> None:
+        self._token = None
+        self._tokenexpire = None
+        self._refreshtoken = None
+        self._refreshexpire = None
+        self._save_tokens()
+
+    @sleep_and_retry
+    @limits(calls=C.CALLS, period=C.RATE_LIMIT)
+    def make_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        try:
+            # Setting a default timeout for requests
+            kwargs.setdefault('timeout', C.API_TIMEOUT)
+            headers = kwargs.setdefault('headers', {})
+            headers.setdefault('User-Agent', "curl/7.81.0")
+            headers.setdefault('Accept', "*/*")
+            resp = requests.request(method, url, **kwargs)
+            # Handling 429 Too Many Requests with retry
+            if resp.status_code == 429:
+                retry_after = int(resp.headers.get("Retry-After", "5"))
+                _LOGGER.info("Rate limited. Retrying after %s seconds.", retry_after)
+                time.sleep(retry_after)
+                raise HTTPError("429 Too Many Requests")
+            # Raise for other HTTP errors
+            resp.raise_for_status()
+            return resp
+        except (ConnectionError, NewConnectionError, socket.gaierror) as e:
+            _LOGGER.error("Network error occurred: %s. Retrying...", e)
+            raise e  # Re-raise to allow retry mechanisms to handle this
+        except Timeout as e:
+            _LOGGER.error("Request timed out: %s. Retrying...", e)
+            raise e
+        except HTTPError as e:
+            _LOGGER.error("HTTP error occurred: %s. Retrying...", e)
+            raise e
+
+    @retry(
+        retry=retry_if_exception_type(requests.exceptions.HTTPError),
+        stop=stop_after_attempt(5),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
+    def login(self, refresh: bool = False) -> None:
+        if refresh and self._refreshtoken: # token refresh
+            refresh_path = urljoin(C.API_PATH, C.API_TOKEN_REFRESH)
+            _LOGGER.info("Refreshing token in to %s with email %s", refresh_path, self._email)
+            resp = self.make_request('POST', refresh_path, data={'refreshToken': self._refreshtoken})
+            _LOGGER.debug("Refresh (%s) status code: %s", self._email, resp.status_code)
+        else:  # initial login
+            login_path = urljoin(C.API_PATH, C.API_LOGIN)
+            _LOGGER.info("Logging in to %s with email %s", login_path, self._email)
+            try:
+                resp = self.make_request('POST', login_path, data={'email': self._email, 'password': self._password})
+            except HTTPError as e:
+                # rejected credentials do not get better by retrying
+                if e.response is not None and e.response.status_code in (400, 401, 403):
+                    raise InvalidAuth() from e
+                raise
+            _LOGGER.debug("Login (%s) status code: %s", self._email, resp.status_code)
+        try:
+            assert resp, "No response from login"
+            assert resp.status_code == 200, f"Status code is not 200 {resp.status_code}"
+            assert "application/json" in resp.headers.get("content-type"), f"Bad content type"
+            data = resp.json()
+            _LOGGER.debug("%s", data)
+            assert "data" in data, f"Bad json, data not found"
+            error = data.get("error")
+            if error is not None:
+                self._clear_tokens()
+                raise AssertionError(f"Error {error}")
+            data = data["data"]
+            assert isinstance(data, dict), f"Data is not dict: {data}"
+            assert "token" in data, f"Bad data, token not found"
+            token = data["token"]
+            assert isinstance(token, dict), f"Token is not dict: {token}"
+            assert "accessToken" in token, f"Bad token data, accessToken not found"
+            assert "refreshToken" in token, f"Bad token data, refreshToken not found"
+            self._token = token.get("accessToken")
+            self._tokenexpire = datetime.strptime(token.get("expire"), "%Y-%m-%dT%H:%M:%S%z")
+            self._refreshtoken = token.get("refreshToken")
+            self._refreshexpire = datetime.strptime(token.get("refreshExpire"), "%Y-%m-%dT%H:%M:%S%z")
+            _LOGGER.info(
+                "Successful refreshed token for email %s"
+                if refresh else
+                "Successful login for email %s",
+                self._email,
+            )
+            self._save_tokens()
+        except Exception as e:
+            _LOGGER.error(
+                "Failed to login/refresh token for email %s, response was: %s, err: %s",
+                self._email, resp, e,
+            )
+            raise InvalidAuth()
+
+    def auth(self) -> None:
+        with self._lock:
+            tzinfo = timezone(timedelta(hours=+3.0))
+            # tzinfo = datetime.now(timezone.utc).astimezone().tzinfo
+            now = datetime.now(tzinfo)
+            tokenexpire = self._tokenexpire or now
+            refreshexpire = self._refreshexpire or now
+            if self._token and tokenexpire > now:
+                return None
+            refresh = bool(self._token and self._refreshtoken and refreshexpire > now)
+        if refresh:
+            _LOGGER.info("Token to be refreshed")
+        else:
+            _LOGGER.info("Token expired or empty")
+        # concurrent callers share one login and its outcome
+        return self._single_flight.do(("login", self.account_id), self.login, refresh=refresh)
+
+    def pull_data(self, connect: bool = True) -> None:
+        """Discover devices, then open the websocket unless `connect` is False."""
+        self.auth()
+        headers = {
+            'X-Auth-Token': self._token,
+            'User-Agent': 'evo-mobile',
+            'Device-Id': str(uuid.uuid4()),
+            'Content-Type': 'application/json'
+        }
+        # the jobs never wait on each other, pull_data may itself run on the executor
+        device_futures = []
+        part, last_part_seen = 1, True
+        while last_part_seen and part <= C.API_DEVICES_MAX_PARTS:
+            # request a whole wave of partitions at once, devices are
+            # registered as soon as their partition arrives
+            wave = range(part, min(part + C.API_DEVICES_PARTS, C.API_DEVICES_MAX_PARTS + 1))
+            part_futures = {self.executor.submit(self._get_devices_part, p, headers): p for p in wave}
+            last_part_seen = False
+            for future in as_completed(part_futures):
+                devices = future.result()
+                if devices is None:
+                    continue
+                if part_futures[future] == wave[-1]:
+                    last_part_seen = True
+                for device in devices:
+                    device_futures.append(self.executor.submit(
+                        self._add_device, device["device_mac"], device["device_serial"], device["device_title"],
+                    ))
+            part = wave[-1] + 1
+        for future in device_futures:
+            future.result()
+        if connect and len(self.devices) > 0:
+            self.connect_in_thread()
+
+    def _get_devices_part(self, part: int, headers: dict) -> list[dict] | None:
+        """Get devices listed in one smartHome partition, None for an empty partition."""
+        devices_path = urljoin(C.API_PATH, C.API_DEVICES.format(
+            part=part,
+            weight=C.API_DEVICES_PARTITION_WEIGHT,
+        ))
+        _LOGGER.debug("Getting devices, url: %s", devices_path)
+        try:
+            resp = self.make_request("GET", devices_path, headers=headers)
+        except HTTPError:
+            resp = None
+        containers = None
+        if resp is not None and "application/json" in resp.headers.get("content-type", ""):
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("%s", resp.text)
+            data = resp.json().get("data") or {}
+            containers = data.get("presentation", {}).get("layout", {}).get('scrollContainer', [])
+        if not containers:
+            if part == 1:
+                _LOGGER.error("Failed to get devices, response was: %s", resp)
+                raise InvalidDevicesList()
+            return None
+        devices = []
+        for item in containers:
+            if item.get("contractName", "") != "deviceList":
+                continue
+            state_data = item.get("state") or "{}"
+            state_json = json.loads(state_data) if isinstance(state_data, str) else state_data
+            for d in state_json.get('items', []):
+                # haierevo://device?deviceId=12:34:56:78:90:68&type=AC&serialNum=AAC0M1E0000000000000&uitype=AC_BASE
+                device_link = d.get('action', {}).get('link', '')
+                query_params = parse_qs(urlparse(device_link).query)
+                device_mac = query_params.get('deviceId', [''])[0].replace('%3A', ':')
+                if not device_mac:  # not a smart device
+                    continue
+                devices.append({
+                    "device_mac": device_mac,
+                    "device_serial": query_params.get('serialNum', [''])[0],
+                    "device_title": d.get('title', ''),
+                })
+        return devices
+
+    def _add_device(self, device_mac: str, device_serial: str, device_title: str) -> None:
+        with self._devices_lock:
+            if device_mac in self._pending_devices or self.get_device_by_id(device_mac) is not None:
+                return
+            # reserve the mac so that a device listed in several partitions is added once
+            self._pending_devices.add(device_mac)
+        _LOGGER.info(
+            "Received device successfully, device title %s, device mac %s, device serial %s",
+            device_title, device_mac, device_serial,
+        )
+        try:
+            device = HaierFridge(
+                haier=self,
+                device_mac=device_mac,
+                device_serial=device_serial,
+                device_title=device_title
+            )
+        finally:
+            with self._devices_lock:
+                self._pending_devices.discard(device_mac)
+        with self._devices_lock:
+            self.devices.append(device)
+            self._devices_by_id[device.device_id] = device
+
+    def request_once(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call `fn` unless a call for `key` is in flight or just completed, then share its outcome."""
+        return self._single_flight.do(key, fn, *args, **kwargs)
+
+    def forget_request(self, key: Hashable) -> None:
+        self._single_flight.forget(key)
+
+    def get_device_by_id(self, id_: str) -> HaierFridge | None:
+        return self._devices_by_id.get(id_)
+
+    def _init_ws(self) -> WebSocketApp | None:
+        """Create the socket app, None if a disconnect was requested meanwhile."""
+        self.auth()
+        app = WebSocketApp(
+            url=urljoin(C.API_WS_PATH, self.token),
+            on_message=self._on_message,
+            on_open=self._on_open,
+            on_ping=self._on_ping,
+            on_close=self._on_close,
+        )
+        with self._socket_lock:
+            if self._disconnect_requested:
+                return None
+            self._socket_app = app
+        return app
+
+    # noinspection PyUnusedLocal
+    def _on_message(self, ws: WebSocket, message: str) -> None:
+        _LOGGER.debug("Received WSS message: %s", message)
+        if self._recorder is not None:
+            self._recorder.record("in", message)
+        message_dict: dict = json.loads(message)
+        message_device = message_dict.get("macAddress")
+        device = self.get_device_by_id(message_device)
+        # unknown macs share one counter, the server must not grow the diagnostics
+        self.traffic.count(device.device_id if device is not None else UNKNOWN_DEVICE, "in", message)
+        if device is None:
+            _LOGGER.error("Got a message for a device we don't know about: %s", message_device)
+        else:
+            device.on_message(message_dict)
+
+    # noinspection PyMethodMayBeStatic,PyUnusedLocal
+    def _on_open(self, ws: WebSocketApp) -> None:
+        if self._disconnect_requested:
+            # closed before run_forever started, which would have undone that close
+            ws.close()
+            return
+        _LOGGER.debug("Websocket opened")
+        self._reconnect_delay = C.RECONNECT_DELAY_MIN
+        self._stop_polling()
+        if self._flush_command_queues():
+            self._connected.set()
+
+    # noinspection PyUnusedLocal
+    def _on_ping(self, ws: WebSocket) -> None:
+        self._socket_app.sock.pong()
+
+    # noinspection PyUnusedLocal
+    def _on_close(self, ws: WebSocket, close_code: int, close_message: str) -> None:
+        _LOGGER.debug("Socket closed. Code: %s, message: %s", close_code, close_message)
+        self._auto_reconnect_if_needed()
+
+    def _auto_reconnect_if_needed(self, command: str = None) -> None:
+        self._socket_status = SocketStatus.NOT_INITIALIZED
+        self._connected.clear()
+        if not self._disconnect_requested:
+            # a failed attempt closes the socket too, back off so that they do not follow back to back
+            delay = self._reconnect_delay
+            self._reconnect_delay = min(delay * 2, C.RECONNECT_DELAY_MAX)
+            _LOGGER.debug("Automatically reconnecting on unwanted closed socket in %s seconds. %s", delay, command)
+            self._start_polling()
+            self.connect_in_thread(delay)
+        else:
+            _LOGGER.debug("Disconnect was explicitly requested, not attempting to reconnect")
+
+    def connect(self) -> None:
+        if self._disconnect_requested:
+            _LOGGER.debug("Disconnect was explicitly requested, not connecting")
+        elif self._socket_status not in [
+            SocketStatus.INITIALIZED,
+            SocketStatus.INITIALIZING,
+        ]:
+            self._socket_status = SocketStatus.INITIALIZING
+            _LOGGER.debug("Connecting to websocket (%s)", C.API_WS_PATH)
+            app = self._init_ws()
+            if app is None:
+                _LOGGER.debug("Disconnect was requested while connecting, not connecting")
+                return
+            try:
+                app.run_forever()
+            except WebSocketException: # socket is already opened
+                pass
+        else:
+            _LOGGER.debug(
+                "Can not attempt socket connection because of current socket status: %s",
+                self._socket_status,
+            )
+
+    def wait_connected(self, timeout: float | None = None) -> bool:
+        """Block until the websocket is open, return False on timeout."""
+        return self._connected.wait(timeout)
+
+    def disconnect(self) -> None:
+        with self._socket_lock:
+            self._disconnect_requested = True
+            app = self._socket_app
+        self._reconnect_wake.set()
+        self._stop_polling()
+        if app is not None:
+            app.close()
+
+    def close(self, timeout: float = C.CLOSE_TIMEOUT) -> None:
+        """Disconnect and wait up to `timeout` seconds for background threads to exit."""
+        deadline = time.monotonic() + timeout
+        self.disconnect()
+        # no socket thread starts once the disconnect is requested
+        with self._socket_lock:
+            threads = list(self._socket_threads)
+        with self._poll_lock:
+            threads += self._poll_threads
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+            if thread.is_alive():
+                _LOGGER.warning("Thread %s did not stop within %s seconds", thread.name, timeout)
+        with self._queue_lock:
+            dropped = sum(len(queue) for queue in self._command_queues.values())
+            self._command_queues.clear()
+        if dropped:
+            _LOGGER.warning("Dropped %s queued commands on close", dropped)
+        with self._queue_lock:
+            self._pending_acks.clear()
+        if self._token:
+            self._save_tokens()
+        self.stop_capture()
+        with self._socket_lock:
+            self._socket_app = None
+            self._socket_threads.clear()
+        with self._poll_lock:
+            self._poll_threads.clear()
+        self.executor.shutdown()
+
+    def _connect_after(self, delay: float) -> None:
+        if delay > 0 and self._reconnect_wake.wait(delay):
+            return  # disconnect requested while backing off
+        self.connect()
+
+    def connect_in_thread(self, delay: float = 0) -> None:
+        thread = threading.Thread(target=self._connect_after, args=(delay,), name=f"{C.DOMAIN}_socket")
+        thread.daemon = True
+        with self._socket_lock:
+            self._socket_threads = [t for t in self._socket_threads if t.is_alive()]
+            self._socket_threads.append(thread)
+        thread.start()
+
+    def send_message(self, payload: str, device_id: str | None = None) -> bool:
+        _LOGGER.debug("Sending message: %s", payload)
+        if self._socket_status != SocketStatus.INITIALIZED:
+            return False
+        return self._send(payload, device_id)
+
+    def _send(self, payload: str, device_id: str | None = None) -> bool:
+        try:
+            self._socket_app.send(payload)
+        except WebSocketConnectionClosedException:
+            self._auto_reconnect_if_needed()
+            return False
+        self.traffic.count(device_id, "out", payload)
+        if self._recorder is not None:
+            self._recorder.record("out", payload)
+        return True
+
+    def send_command(self, device_id: str, command_name: str, payload: str, trace: str | None = None) -> bool:
+        """Send a device command, queue it while the socket is down, return False if it was queued."""
+        sent = False
+        while not sent:
+            sent = self.send_message(payload, device_id)
+            if not sent and self._queue_command(device_id, command_name, payload, trace):
+                break
+        self._boost_polling(device_id)
+        return sent
+
+    def send_commands(self, device_id: str, messages: list[tuple[str, str, str]]) -> CommandBatch:
+        """Send (command name, trace, payload) messages back to back, acknowledged as one batch."""
+        batch = CommandBatch(trace for _, trace, _ in messages)
+        expire_before = time.monotonic() - C.COMMAND_QUEUE_TTL
+        with self._queue_lock:
+            # traces that were never answered
+            for trace in [t for t, b in self._pending_acks.items() if b.created < expire_before]:
+                del self._pending_acks[trace]
+            for trace in batch.traces:
+                self._pending_acks[trace] = batch
+        for command_name, trace, payload in messages:
+            if not self.send_command(device_id, command_name, payload, trace):
+                batch.queued = True
+        return batch
+
+    def ack_command(self, trace: str | None) -> None:
+        """Record the device response to the command sent with `trace`."""
+        with self._queue_lock:
+            batch = self._pending_acks.pop(trace, None)
+        if batch is not None:
+            batch.ack(trace)
+
+    def _queue_command(
+        self,
+        device_id: str,
+        command_name: str,
+        payload: str,
+        trace: str | None = None,
+        queued_at: float | None = None,
+    ) -> bool:
+        """Queue a command until the socket opens, False if it opened meanwhile and nothing was queued."""
+        entry = (time.monotonic() if queued_at is None else queued_at, payload, trace)
+        with self._queue_lock:
+            if self._socket_status == SocketStatus.INITIALIZED:
+                return False
+            queue = self._command_queues.setdefault(device_id, OrderedDict())
+            # a newer value for the same attribute supersedes the queued one
+            superseded = queue.pop(command_name, None)
+            if superseded is not None and superseded[0] > entry[0]:
+                # requeued after a failed replay, older than what was queued meanwhile
+                superseded, entry = entry, superseded
+            queue[command_name] = entry
+            while len(queue) > C.COMMAND_QUEUE_SIZE:
+                dropped, _ = queue.popitem(last=False)
+                _LOGGER.warning("Command queue for device %s is full, dropped command %s", device_id, dropped)
+        if superseded is not None:
+            # it will never be sent, its batch is settled by the newer command
+            self.ack_command(superseded[2])
+        _LOGGER.debug("Socket is not connected, queued command %s for device %s", command_name, device_id)
+        return True
+
+    def _start_polling(self) -> None:
+        with self._poll_lock:
+            if self._disconnect_requested:
+                return  # close() may already have collected the threads to join
+            self._poll_threads = [t for t in self._poll_threads if t.is_alive()]
+            if self._poll_threads and not self._poll_stop.is_set():
+                return
+            self._poll_stop = threading.Event()
+            thread = threading.Thread(
+                target=self._poll,
+                args=(self._poll_stop,),
+                name=f"{C.DOMAIN}_poll",
+                daemon=True,
+            )
+            self._poll_threads.append(thread)
+            thread.start()
+
+    def _stop_polling(self) -> None:
+        with self._poll_lock:
+            self._poll_stop.set()
+
+    def _boost_polling(self, device_id: str) -> None:
+        """Poll a device soon after it was changed from here."""
+        self._poll_intervals.pop(device_id, None)
+        due = time.monotonic() + C.POLL_AFTER_COMMAND
+        self._poll_due[device_id] = min(self._poll_due.get(device_id, due), due)
+
+    def _poll(self, stop: threading.Event) -> None:
+        """Poll device statuses over REST while the websocket is down."""
+        _LOGGER.info("Websocket is unavailable, polling device statuses")
+        # spread the calls left after auth and reconnects over the rate limit window,
+        # the first poll waits a full spacing so short socket blips cost no calls
+        spacing = C.RATE_LIMIT / max(C.CALLS - C.POLL_RESERVED_CALLS, 1)
+        last_poll = time.monotonic()
+        while not stop.is_set():
+            devices = list(self.devices)
+            if not devices:
+                stop.wait(C.POLL_INTERVAL_MAX)
+                continue
+            min_interval = len(devices) * spacing
+            now = time.monotonic()
+            device = min(devices, key=lambda d: self._poll_due.setdefault(d.device_id, now))
+            delay = max(self._poll_due[device.device_id], last_poll + spacing) - now
+            if delay > 0:
+                stop.wait(min(delay, C.POLL_TICK))
+                continue
+            last_poll = now
+            try:
+                self.auth()
+                changed = device.poll_status()
+            except Exception as e:
+                _LOGGER.error("Failed to poll device %s status: %s", device.device_id, e)
+                changed = False
+            if changed or device.door_open:
+                interval = min_interval
+            else:  # back off while values are stable
+                interval = min(self._poll_intervals.get(device.device_id, min_interval) * 2, C.POLL_INTERVAL_MAX)
+            self._poll_intervals[device.device_id] = max(interval, min_interval)
+            self._poll_due[device.device_id] = time.monotonic() + self._poll_intervals[device.device_id]
+        _LOGGER.info("Stopped polling device statuses")
+
+    def analyze_thermal(self) -> list[tuple[HaierFridge, frozenset[str]]]:
+        """Analyse the temperature history of all devices, return the anomalies that just appeared."""
+        devices = list(self.devices)
+        states = analysis.analyze(
+            [device.history for device in devices],
+            [device.door_open for device in devices],
+            time.monotonic(),
+        )
+        appeared = []
+        for device, state in zip(devices, states):
+            new = state.anomalies - device.thermal.anomalies
+            if new:
+                appeared.append((device, new))
+            device.set_thermal(state)
+        return appeared
+
+    def _flush_command_queues(self) -> bool:
+        """Replay queued commands on the new socket, then mark it ready, False if it failed meanwhile.
+
+        Commands are sent directly only once the socket is ready, so a newer
+        value is never overtaken by the replay of an older one.
+        """
+        expire_before = time.monotonic() - C.COMMAND_QUEUE_TTL
+        while True:
+            with self._queue_lock:
+                if not self._command_queues:
+                    self._socket_status = SocketStatus.INITIALIZED
+                    return True
+                queues, self._command_queues = self._command_queues, {}
+            commands = [
+                (device_id, command_name, *entry)
+                for device_id, queue in queues.items()
+                for command_name, entry in queue.items()
+            ]
+            for i, (device_id, command_name, queued_at, payload, trace) in enumerate(commands):
+                if queued_at < expire_before:
+                    _LOGGER.warning("Dropped expired command %s for device %s", command_name, device_id)
+                    continue
+                _LOGGER.debug("Replaying queued command %s for device %s", command_name, device_id)
+                if not self._send(payload, device_id):
+                    # closed again, keep the rest for the next socket
+                    for device_id, command_name, queued_at, payload, trace in commands[i:]:
+                        if queued_at >= expire_before:
+                            self._queue_command(device_id, command_name, payload, trace, queued_at)
+                    return False
+
+
+class HaierFridge(object):
+
+    def __init__(self, haier: Haier, device_mac: str, device_serial: str, device_title: str) -> None:
+        self._haier = haier
+        self._device_id = device_mac
+        self._device_serial = device_serial
+        self._device_name = device_title
+        # Device information
+        self.model_name = "Fridge"
+        self._sw_version = None
+        self._profile = get_profile(self.model_name)
+        # Status cache
+        self._status_fetched: float | None = None
+        self._status_etag: str | None = None
+        self._status_last_modified: str | None = None
+        self._attribute_values: dict[str, str] = {}
+        # Decoded attribute values by attribute id
+        self._values: dict[str, Any] = {}
+        # Temperature history and its latest analysis
+        self._history = analysis.TemperatureHistory()
+        self._thermal = analysis.ThermalState()
+        self._listeners: list[Callable[[], None]] = []
+        # Get initial status
+        self._get_status()
+
+    @property
+    def device_id(self) -> str:
+        return self._device_id
+
+    @property
+    def device_mac(self) -> str:
+        return self._device_id
+
+    @property
+    def device_name(self) -> str:
+        return self._device_name
+
+    @property
+    def sw_version(self) -> str:
+        return self._sw_version
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique ID for this device."""
+        return f"haier_evo_fridge_{self._device_id}"
+
+    @property
+    def profile(self) -> DeviceProfile:
+        return self._profile
+
+    @property
+    def values(self) -> dict[str, Any]:
+        """Decoded attribute values by attribute id, read only."""
+        return self._values
+
+    # Temperature sensors
+    @property
+    def fridge_temperature(self) -> float | None:
+        return self._values.get(C.ATTR_FRIDGE_TEMP)
+
+    @property
+    def freezer_temperature(self) -> float | None:
+        return self._values.get(C.ATTR_FREEZER_TEMP)
+
+    @property
+    def ambient_temperature(self) -> float | None:
+        return self._values.get(C.ATTR_AMBIENT_TEMP)
+
+    # Temperature controls
+    @property
+    def fridge_target_temperature(self) -> float | None:
+        return self._values.get(C.ATTR_FRIDGE_TEMP)
+
+    @property
+    def freezer_target_temperature(self) -> float | None:
+        return self._values.get(C.ATTR_FREEZER_CONTROL)
+
+    # Door state
+    @property
+    def door_open(self) -> bool:
+        return self._values.get(C.ATTR_FRIDGE_DOOR, False)
+
+    # Modes
+    @property
+    def vacation_mode(self) -> bool:
+        return self._values.get(C.ATTR_VACATION_MODE, False)
+
+    @property
+    def super_cool_mode(self) -> bool:
+        return self._values.get(C.ATTR_SUPER_COOL, False)
+
+    @property
+    def super_freeze_mode(self) -> bool:
+        return self._values.get(C.ATTR_SUPER_FREEZE, False)
+
+    @property
+    def history(self) -> analysis.TemperatureHistory:
+        return self._history
+
+    @property
+    def thermal(self) -> analysis.ThermalState:
+        """Latest thermal analysis, see Haier.analyze_thermal."""
+        return self._thermal
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """Decoded device state by attribute name."""
+        return {attribute.name: self._values.get(attribute.id) for attribute in self._profile.attributes}
+
+    def set_thermal(self, state: analysis.ThermalState) -> None:
+        if state == self._thermal:
+            return  # analysed every ANALYSIS_INTERVAL, mostly with the same outcome
+        self._thermal = state
+        self.notify_listeners()
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call `listener` on every state change, return a function removing it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def notify_listeners(self) -> None:
+        """Tell listeners that the device state changed."""
+        for listener in list(self._listeners):
+            listener()
+
+    async def update(self) -> None:
+        """Update the device state."""
+        await self._haier.executor.async_run(self._get_status)
+
+    def poll_status(self) -> bool:
+        """Fetch the device status, return True if any attribute changed."""
+        return self._get_status()
+
+    def on_message(self, message_dict: dict) -> None:
+        message_type = message_dict.get("event", "")
+        if message_type == "status":
+            self._handle_status_update(message_dict)
+        elif message_type == "command_response":
+            self._haier.ack_command(message_dict.get("trace"))
+        elif message_type == "info":
+            pass
+        elif message_type == "deviceStatusEvent":
+            self._handle_device_status_update(message_dict)
+        else:
+            _LOGGER.warning("Got unknown message: %s", message_dict)
+
+    def _set_attribute(self, key, value) -> None:
+        """Set device attribute value."""
+        self._attribute_values[key] = value
+        attribute = self._profile.by_id.get(key)
+        if attribute is None:
+            return
+        try:
+            self._values[key] = attribute.decode(value)
+        except (ValueError, TypeError) as e:
+            _LOGGER.error("Error setting attribute %s=%s: %s", key, value, e)
+
+    def _fetch_status(self) -> dict | None:
+        """Fetch the status document, None if it did not change or could not be fetched."""
+        status_url = C.API_STATUS.replace("{mac}", self.device_id)
+        headers = {"X-Auth-token": self._haier.token}
+        if self._status_etag:
+            headers["If-None-Match"] = self._status_etag
+        if self._status_last_modified:
+            headers["If-Modified-Since"] = self._status_last_modified
+        _LOGGER.debug("Getting status of device %s, url: %s", self.device_id, status_url)
+        # within the account's rate limit, a 304 is not an error
+        try:
+            resp = self._haier.make_request("GET", status_url, headers=headers)
+        except HTTPError:
+            return None
+        if resp.status_code == 304:
+            _LOGGER.debug("Device %s status not modified", self.device_id)
+            return None
+        if resp.status_code != 200:
+            return None
+        _LOGGER.debug("Update device %s status code: %s", self.device_id, resp.status_code)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s", resp.text)
+        self._status_etag = resp.headers.get("ETag")
+        self._status_last_modified = resp.headers.get("Last-Modified")
+        return resp.json()
+
+    def _get_status(self) -> bool:
+        """Get device status, static device metadata is cached for STATUS_CACHE_TTL."""
+        changed = metadata_changed = False
+        # entities updating together share one request
+        data = self._haier.request_once(("status", self.device_id), self._fetch_status)
+        if data is not None:
+            now = time.monotonic()
+            if self._status_fetched is None or now - self._status_fetched > C.STATUS_CACHE_TTL:
+                # Get device info
+                device_info = data.get("info", {})
+                device_model = device_info.get("model", "Fridge")
+                _LOGGER.debug("Device model %s", device_model)
+                # Get firmware version
+                settings = data.get("settings", {})
+                sw_version = settings.get('firmware', {}).get('value')
+                metadata_changed = (device_model, sw_version) != (self.model_name, self._sw_version)
+                self.model_name = device_model
+                # Compiled once per model
+                self._profile = get_profile(device_model)
+                self._sw_version = sw_version
+                self._status_fetched = now
+            # Process changed attributes only
+            for attr in data.get("attributes", []):
+                key = attr.get('name', '')
+                value = attr.get('currentValue')
+                if key in self._attribute_values and self._attribute_values[key] == value:
+                    continue
+                self._set_attribute(key, value)
+                changed = True
+            _LOGGER.debug("Device status: %s", self.state)
+            self._record_history()
+        # not modified or unchanged, every listener would only rewrite its state
+        if changed or metadata_changed:
+            self.notify_listeners()
+        return changed
+
+    def _handle_status_update(self, received_message: dict) -> None:
+        """Handle status update from websocket."""
+        message_statuses = received_message.get("payload", {}).get("statuses", [{}])
+        properties = message_statuses[0].get('properties', {})
+        _LOGGER.debug(
+            "Received websocket message for device %s:\n"
+            "Full message: %s\n"
+            "Status payload: %s\n"
+            "Properties: %s",
+            self.device_id, received_message, message_statuses, properties,
+        )
+        for key, value in properties.items():
+            _LOGGER.debug("Setting attribute %s = %s", key, value)
+            self._set_attribute(key, value)
+        self._record_history()
+        self.notify_listeners()
+
+    def _record_history(self) -> None:
+        # compartments without a measured temperature in the profile stay empty and are not analysed
+        temperatures, setpoints = [], []
+        for compartment in analysis.COMPARTMENTS:
+            temperature_id, setpoint_id = self._profile.compartments.get(compartment, (None, None))
+            temperatures.append(self._values.get(temperature_id) if temperature_id else None)
+            setpoints.append(self._values.get(setpoint_id) if setpoint_id else None)
+        self._history.record(time.monotonic(), *temperatures, *setpoints)
+
+    def _handle_device_status_update(self, received_message: dict) -> None:
+        """Handle device status update from websocket."""
+        _LOGGER.debug("Received device status update %s %s", self.device_id, received_message)
+        self.notify_listeners()
+
+    async def async_set_fridge_temperature(self, temperature: int) -> None:
+        """Set fridge temperature."""
+        await self.async_set_value("fridge_temperature", temperature)
+
+    async def async_set_freezer_temperature(self, temperature: int) -> None:
+        """Set freezer temperature."""
+        await self.async_set_value("freezer_target_temperature", temperature)
+
+    async def async_set_vacation_mode(self, enabled: bool) -> None:
+        """Set vacation mode."""
+        await self.async_set_value("vacation_mode", enabled)
+
+    async def async_set_super_cool_mode(self, enabled: bool) -> None:
+        """Set super cool mode."""
+        await self.async_set_value("super_cool_mode", enabled)
+
+    async def async_set_super_freeze_mode(self, enabled: bool) -> None:
+        """Set super freeze mode."""
+        await self.async_set_value("super_freeze_mode", enabled)
+
+    async def async_set_value(self, name: str, value: Any) -> None:
+        """Set an attribute named in the device profile."""
+        await self._haier.executor.async_run(self.set_value, name, value)
+
+    async def async_set_values(self, changes: Mapping[str, Any]) -> CommandBatch:
+        """Set several attributes named in the device profile in one operation."""
+        return await self._haier.executor.async_run(self.set_values, changes)
+
+    def set_value(self, name: str, value: Any) -> CommandBatch:
+        """Set an attribute named in the device profile, e.g. vacation_mode=True."""
+        return self.set_values({name: value})
+
+    def set_values(self, changes: Mapping[str, Any]) -> CommandBatch:
+        """Validate all changes against the device profile, then send them as one operation."""
+        commands = []
+        for name, value in changes.items():
+            attribute = self._profile.by_name.get(name)
+            if attribute is None:
+                raise HaierError(f"Model {self.model_name} has no attribute {name}")
+            try:
+                encoded = attribute.validate(value)
+            except (ValueError, TypeError) as e:
+                raise HaierError(f"Invalid value {value!r} for {name}: {e}") from e
+            commands.append({"id": attribute.id, "value": encoded})
+        batch = self._send_commands(commands)
+        for command in commands:
+            attribute = self._profile.by_id[command["id"]]
+            self._values[attribute.id] = attribute.decode(command["value"])
+        self.notify_listeners()
+        return batch
+
+    def _send_commands(self, commands: list[dict]) -> CommandBatch:
+        """Send commands to device, as one operation frame if the model has one."""
+        # local state is set optimistically, make the next status fetch apply the real values
+        for command in commands:
+            self._attribute_values.pop(command["id"], None)
+        self._haier.forget_request(("status", self.device_id))
+        if len(commands) > 1 and self._profile.command_name:
+            trace_id = str(uuid.uuid4())
+            message = {
+                "action": "operation",
+                "macAddress": self.device_id,
+                "commandName": self._profile.command_name,
+                "commands": [
+                    {"commandName": command["id"], "value": command["value"]}
+                    for command in commands
+                ],
+                "trace": trace_id,
+            }
+            messages = [(",".join(command["id"] for command in commands), trace_id, message)]
+        else:
+            messages = []
+            for command in commands:
+                trace_id = str(uuid.uuid4())
+                messages.append((command["id"], trace_id, {
+                    "action": "command",
+                    "macAddress": self.device_id,
+                    "command": {
+                        "commandName": command["id"],
+                        "value": command["value"]
+                    },
+                    "trace": trace_id
+                }))
+        _LOGGER.debug("Sending commands to device %s: %s", self.device_id, [m for _, _, m in messages])
+        return self._haier.send_commands(
+            self.device_id,
+            [(command_name, trace_id, json.dumps(message)) for command_name, trace_id, message in messages],
+        )
@@ -0,0 +1,115 @@
+"""
+Capture and replay of Haier Evo websocket traffic.
+
+Captures are gzipped JSON lines, one record per frame:
+{"t": <monotonic seconds>, "dir": "in" | "out", "data": <frame text>}
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator
+from .logger import _LOGGER
+from . import const as C # noqa
+
+if TYPE_CHECKING:
+    from .api import Haier
+
+
+class TrafficRecorder(object):
+    """Append frames to a rotating gzip JSONL capture."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = C.CAPTURE_MAX_BYTES,
+        backups: int = C.CAPTURE_BACKUPS,
+    ) -> None:
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._lock = threading.Lock()
+        self._raw = None
+        self._file = None
+        self._flushed = 0.0
+        self.records = 0
+        self._open()
+
+    def _open(self) -> None:
+        self._raw = open(self.path, "wb")
+        self._file = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._flushed = time.monotonic()
+
+    def _close(self) -> None:
+        self._file.close()
+        self._raw.close()
+
+    def _rotate(self) -> None:
+        self._close()
+        for n in range(self._backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        if self._backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._open()
+
+    def record(self, direction: str, data: str) -> None:
+        line = json.dumps({"t": round(time.monotonic(), 3), "dir": direction, "data": data}, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line.encode() + b"\n")
+            self.records += 1
+            now = time.monotonic()
+            if self._raw.tell() >= self._max_bytes:
+                self._rotate()
+            elif now - self._flushed >= C.CAPTURE_FLUSH_INTERVAL:
+                # keep what was recorded so far readable if we never get to close
+                self._file.flush()
+                self._flushed = now
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._close()
+                self._file = None
+        _LOGGER.info("Closed capture %s, %s frames recorded", self.path, self.records)
+
+
+def read_capture(path: str) -> Iterator[dict]:
+    """Yield capture records, a capture cut short by a crash ends at its last complete frame."""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    with (gzip.open(path, "rt") if compressed else open(path, "rt")) as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                yield json.loads(line)
+        except EOFError:
+            pass
+
+
+def replay(haier: Haier, path: str, speed: float = 1.0) -> int:
+    """Feed the inbound frames of a capture to `haier`, `speed` 0 replays as fast as possible.
+
+    Returns the number of frames replayed.
+    """
+    count = 0
+    first = started = None
+    for record in read_capture(path):
+        if record.get("dir") != "in":
+            continue
+        if first is None:
+            first, started = record["t"], time.monotonic()
+        if speed > 0:
+            delay = started + (record["t"] - first) / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        haier._on_message(None, record["data"])
+        count += 1
+    return count
@@ -0,0 +1,111 @@
+"""
+Command line client for Haier Evo devices.
+
+Run from the integration directory (or with it on PYTHONPATH):
+
+    python -m core discover
+    python -m core watch
+    python -m core set 12:34:56:78:90:68 vacation_mode=true fridge_temperature=4
+
+Credentials are taken from --email/--password or the HAIER_EVO_EMAIL and
+HAIER_EVO_PASSWORD environment variables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any
+from .api import Haier, HaierError, HaierFridge
+from . import const as C # noqa
+
+
+def _print_state(device: HaierFridge) -> None:
+    print(json.dumps({
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "mac": device.device_mac,
+        **device.state,
+    }), flush=True)
+
+
+def _parse_change(text: str) -> tuple[str, Any]:
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--email", default=os.environ.get("HAIER_EVO_EMAIL"))
+    parser.add_argument("--password", default=os.environ.get("HAIER_EVO_PASSWORD"))
+    parser.add_argument("--storage", default=os.path.expanduser("~/.haier_evo"), help="directory for the tokens file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("discover", help="list devices")
+    watch = commands.add_parser("watch", help="print device states as JSON lines until interrupted")
+    watch.add_argument("--capture", help="also record websocket traffic to this file")
+    command = commands.add_parser("set", help="change device attributes in one operation")
+    command.add_argument("mac")
+    command.add_argument(
+        "changes", nargs="+", type=_parse_change, metavar="NAME=VALUE",
+        help="attribute name from the device profile and a JSON value, e.g. vacation_mode=true",
+    )
+    args = parser.parse_args(argv)
+    if not args.email or not args.password:
+        parser.error("--email and --password (or HAIER_EVO_EMAIL and HAIER_EVO_PASSWORD) are required")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(threadName)s %(message)s",
+    )
+    os.makedirs(args.storage, exist_ok=True)
+    haier = Haier(args.email, args.password, args.storage)
+    haier.load_tokens()
+    try:
+        if args.command == "discover":
+            haier.pull_data(connect=False)
+            for device in haier.devices:
+                print(f"{device.device_mac}  {device.model_name}  {device.sw_version}  {device.device_name}")
+        elif args.command == "watch":
+            if args.capture:
+                haier.start_capture(args.capture)
+            haier.pull_data()
+            for device in haier.devices:
+                _print_state(device)
+                device.add_listener(lambda d=device: _print_state(d))
+            while True:
+                time.sleep(1)
+        elif args.command == "set":
+            haier.pull_data()
+            device = haier.get_device_by_id(args.mac)
+            if device is None:
+                print(f"Unknown device {args.mac}", file=sys.stderr)
+                return 1
+            if not haier.wait_connected(C.API_TIMEOUT):
+                print("Could not connect to the websocket", file=sys.stderr)
+                return 1
+            batch = device.set_values(dict(args.changes))
+            if not batch.wait(C.COMMAND_ACK_TIMEOUT):
+                print("The device did not confirm the commands", file=sys.stderr)
+                return 1
+    except KeyboardInterrupt:
+        pass
+    except HaierError as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        haier.close()
+    return 0
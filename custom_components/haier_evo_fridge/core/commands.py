@@ -0,0 +1,69 @@
+"""
+Acknowledgement tracking for commands sent together.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Iterable
+
+
+class CommandBatch(object):
+    """Command messages sent as one operation, done once every trace was answered."""
+
+    def __init__(self, traces: Iterable[str]) -> None:
+        self.traces = frozenset(traces)
+        self.created = time.monotonic()
+        # some commands wait in the queue for the socket to reopen
+        self.queued = False
+        self._lock = threading.Lock()
+        self._pending = set(self.traces)
+        self._done = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        if not self._pending:
+            self._done.set()
+
+    def ack(self, trace: str) -> None:
+        with self._lock:
+            self._pending.discard(trace)
+            if self._pending or self._done.is_set():
+                return
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until all commands were acknowledged, return False on timeout."""
+        return self._done.wait(timeout)
+
+    async def async_wait(self, timeout: float | None = None) -> bool:
+        """Wait on the event loop, without a worker thread, until all commands were acknowledged.
+
+        Return False on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+
+        def callback() -> None:
+            loop.call_soon_threadsafe(done.set)
+
+        with self._lock:
+            if self._done.is_set():
+                return True
+            self._callbacks.append(callback)
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+        return True
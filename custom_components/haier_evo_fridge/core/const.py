@@ -0,0 +1,49 @@
+DOMAIN = "haier_evo_fridge"
+CALLS = 5
+RATE_LIMIT = 60
+API_TIMEOUT = 15
+API_PATH = "https://evo.haieronline.ru"
+API_LOGIN = "v1/users/auth/sign-in"
+API_TOKEN_REFRESH = "v1/users/auth/refresh"
+API_DEVICES = "v2/ru/pages/sduiRawPaginated/smartHome?part={part}&partitionWeight={weight}"
+API_DEVICES_PARTITION_WEIGHT = 6
+# partitions requested concurrently per discovery wave, the login, a wave and the
+# first device status fetch fit one RATE_LIMIT window of CALLS
+API_DEVICES_PARTS = 2
+API_DEVICES_MAX_PARTS = 20
+API_STATUS = "https://iot-platform.evo.haieronline.ru/mobile-backend-service/api/v1/config/{mac}?type=DETAILED"
+STATUS_CACHE_TTL = 6 * 60 * 60  # seconds to keep device model and firmware
+REQUEST_CACHE_TTL = 2  # seconds a shared REST result answers follow-up callers
+API_WS_PATH = "wss://iot-platform.evo.haieronline.ru/gateway-ws-service/ws/"
+COMMAND_QUEUE_SIZE = 16  # commands kept per device while the socket is down
+COMMAND_QUEUE_TTL = 5 * 60  # seconds before a queued command is dropped
+COMMAND_ACK_TIMEOUT = 10  # seconds to wait for a device to confirm a command batch
+POLL_RESERVED_CALLS = 1  # calls per RATE_LIMIT window left for auth and reconnects while polling
+POLL_INTERVAL_MAX = 5 * 60  # slowest status poll while values are stable
+POLL_AFTER_COMMAND = 5  # seconds between a command and the status poll checking it
+POLL_TICK = 1
+EXECUTOR_WORKERS = 4  # threads for this integration's blocking I/O
+EXECUTOR_WAIT_WARNING = 10  # seconds a job may wait for a worker before it is logged
+CLOSE_TIMEOUT = 5  # seconds to wait for background threads on unload
+RECONNECT_DELAY_MIN = 1  # seconds before the first websocket reconnect, doubled per failed attempt
+RECONNECT_DELAY_MAX = 5 * 60
+CAPTURE_MAX_BYTES = 10 * 1024 * 1024  # compressed size before a capture file is rotated
+CAPTURE_BACKUPS = 3
+CAPTURE_FLUSH_INTERVAL = 5
+ANALYSIS_INTERVAL = 60  # seconds between thermal analyses
+ANALYSIS_WINDOW = 6 * 60 * 60  # seconds of temperature history analysed
+ANALYSIS_STEP = 60  # seconds between resampled history points
+ANALYSIS_RISE_WINDOW = 2 * 60 * 60  # seconds the rate of rise is fitted over, several compressor cycles
+ANALYSIS_RISE_ALERT = 1.0  # °C per hour of warming reported as an anomaly
+ANALYSIS_DEVIATION_ALERT = 3.0  # °C away from the setpoint reported as an anomaly
+ANALYSIS_HISTORY_SIZE = 4096  # temperature changes kept per device
+
+# Fridge attributes
+ATTR_FRIDGE_DOOR = "10"  # Door state sensor
+ATTR_AMBIENT_TEMP = "2"  # Ambient temperature
+ATTR_FREEZER_TEMP = "1"  # Freezer temperature
+ATTR_FRIDGE_TEMP = "3"   # Fridge temperature control
+ATTR_FREEZER_CONTROL = "4"  # Freezer temperature control
+ATTR_VACATION_MODE = "8"  # Vacation mode
+ATTR_SUPER_COOL = "6"    # Super cooling mode
+ATTR_SUPER_FREEZE = "7"  # Super freeze mode
@@ -0,0 +1,75 @@
+"""
+Bounded worker pool for the integration's blocking I/O.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+from .logger import _LOGGER
+from . import const as C # noqa
+
+
+class HaierExecutor(object):
+    """Thread pool keeping a slow cloud from tying up Home Assistant's default executor.
+
+    Tracks how many jobs wait for a worker and how long they waited.
+    """
+
+    def __init__(self, max_workers: int = C.EXECUTOR_WORKERS) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{C.DOMAIN}_io")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._jobs = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        submitted = time.monotonic()
+        with self._lock:
+            self._queued += 1
+
+        def run() -> Any:
+            waited = time.monotonic() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._jobs += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            if waited > C.EXECUTOR_WAIT_WARNING:
+                _LOGGER.warning("%s waited %.1f seconds for a worker", getattr(fn, "__name__", fn), waited)
+            return fn(*args)
+
+        def cancelled(future: Future) -> None:
+            if future.cancelled():  # never ran, dropped by shutdown
+                with self._lock:
+                    self._queued -= 1
+
+        try:
+            future = self._pool.submit(run)
+        except RuntimeError:  # shut down
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(cancelled)
+        return future
+
+    async def async_run(self, fn: Callable[..., Any], *args) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    @property
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "jobs": self._jobs,
+                "average_wait": self._total_wait / self._jobs if self._jobs else 0.0,
+                "max_wait": self._max_wait,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and cancel queued ones, running jobs finish on their own."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,50 @@
+import logging
+import threading
+import time
+
+
+LOG_RATE_BURST = 5  # records of one message let through per period
+LOG_RATE_PERIOD = 60  # seconds
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop repeats of a message beyond `burst` per `period` seconds.
+
+    Messages are told apart by their unformatted template, so the filter
+    costs no formatting. The first record let through after a suppression
+    reports how many records were dropped. Debug records are never dropped.
+    """
+
+    def __init__(self, burst: int = LOG_RATE_BURST, period: float = LOG_RATE_PERIOD) -> None:
+        super().__init__()
+        self._burst = burst
+        self._period = period
+        self._lock = threading.Lock()
+        self._windows: dict[tuple, list] = {}  # key -> [window start, count, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG:
+            return True
+        key = (record.levelno, record.msg if isinstance(record.msg, str) else type(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self._period:
+                if len(self._windows) > 1000:  # templates are static, this only guards misuse
+                    self._windows.clear()
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self._burst:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                return False
+        if suppressed and isinstance(record.msg, str) and isinstance(record.args, tuple):
+            record.msg = f"{record.msg} (%d similar messages suppressed)"
+            record.args = (*record.args, suppressed)
+        return True
+
+
+_LOGGER = logging.getLogger("custom_components.haier_evo_fridge")
+_LOGGER.addFilter(RateLimitFilter())
@@ -0,0 +1,163 @@
+"""
+Device profiles compiled into attribute and entity descriptors.
+
+A model's yaml is turned once into immutable descriptors: attribute ids,
+value codecs and the entities to create, so reading a value is a dict
+lookup and a new model only needs a yaml file.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
+
+from .yaml_helper import get_device_config
+
+
+def _decode_bool(value: Any) -> bool:
+    return str(value) == "1"
+
+
+def _encode_bool(value: Any) -> str:
+    return "1" if value else "0"
+
+
+def _encode_number(value: Any) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+# attribute type -> (decode the device value, encode a value for a command)
+CODECS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], str]]] = {
+    "bool": (_decode_bool, _encode_bool),
+    "float": (float, _encode_number),
+    "int": (int, _encode_number),
+    "str": (str, str),
+}
+
+
+@dataclass(frozen=True)
+class AttributeDescriptor:
+    """A device attribute: its id, how to decode it and whether it can be set."""
+
+    name: str
+    id: str
+    type: str
+    decode: Callable[[Any], Any]
+    encode: Callable[[Any], str]
+    writable: bool = False
+    min: float | None = None
+    max: float | None = None
+    step: float | None = None
+
+    def validate(self, value: Any) -> str:
+        """Encode `value` for a command, ValueError if the attribute cannot take it."""
+        if not self.writable:
+            raise ValueError("attribute is read only")
+        if self.type == "bool":
+            if value not in (True, False):
+                raise ValueError("expected a boolean")
+        elif self.type in ("float", "int"):
+            if isinstance(value, bool):
+                raise ValueError("expected a number")
+            number = float(value)
+            if self.min is not None and number < self.min or self.max is not None and number > self.max:
+                raise ValueError(f"expected a value from {self.min} to {self.max}")
+            if self.type == "int" and not number.is_integer():
+                raise ValueError("expected an integer")
+        return self.encode(value)
+
+
+@dataclass(frozen=True)
+class EntityDescriptor:
+    """An entity to create for a device, bound to one attribute."""
+
+    platform: str
+    key: str
+    name: str
+    attribute: AttributeDescriptor
+    device_class: str | None = None
+    state_class: str | None = None
+    unit: str | None = None
+    category: str | None = None
+    icon: str | None = None
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """Compiled profile of a device model."""
+
+    model: str
+    command_name: str | None
+    attributes: tuple[AttributeDescriptor, ...]
+    entities: tuple[EntityDescriptor, ...]
+    by_id: dict[str, AttributeDescriptor] = field(repr=False)
+    by_name: dict[str, AttributeDescriptor] = field(repr=False)
+    by_platform: dict[str, tuple[EntityDescriptor, ...]] = field(repr=False)
+    # compartment -> (measured temperature id, setpoint id or None), for the thermal analysis
+    compartments: dict[str, tuple[str, str | None]] = field(default_factory=dict)
+
+    def entities_for(self, platform: str) -> tuple[EntityDescriptor, ...]:
+        return self.by_platform.get(platform, ())
+
+
+def _compile_attribute(config: dict) -> AttributeDescriptor:
+    type_ = config.get("type", "str")
+    if type_ not in CODECS:
+        raise ValueError(f"Attribute {config.get('name')} has unknown type {type_}")
+    decode, encode = CODECS[type_]
+    return AttributeDescriptor(
+        name=config["name"],
+        id=str(config["id"]),
+        type=type_,
+        decode=decode,
+        encode=encode,
+        writable=bool(config.get("writable", False)),
+        min=config.get("min"),
+        max=config.get("max"),
+        step=config.get("step"),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_profile(model: str) -> DeviceProfile:
+    """Return the compiled profile of a model, compiling its yaml only once."""
+    config = get_device_config(model)
+    attributes = tuple(_compile_attribute(a) for a in config.attributes)
+    by_name = {a.name: a for a in attributes}
+    entities = []
+    for entity in config.entities:
+        if entity["attribute"] not in by_name:
+            raise ValueError(f"Entity {entity['key']} refers to unknown attribute {entity['attribute']}")
+        entities.append(EntityDescriptor(
+            platform=entity["platform"],
+            key=entity["key"],
+            name=entity["name"],
+            attribute=by_name[entity["attribute"]],
+            device_class=entity.get("device_class"),
+            state_class=entity.get("state_class"),
+            unit=entity.get("unit"),
+            category=entity.get("category"),
+            icon=entity.get("icon"),
+        ))
+    by_platform: dict[str, tuple[EntityDescriptor, ...]] = {}
+    for entity in entities:
+        by_platform[entity.platform] = by_platform.get(entity.platform, ()) + (entity,)
+    compartments: dict[str, tuple[str, str | None]] = {}
+    for compartment, names in config.compartments.items():
+        for name in names.values():
+            if name not in by_name:
+                raise ValueError(f"Compartment {compartment} refers to unknown attribute {name}")
+        setpoint = names.get("setpoint")
+        compartments[compartment] = (by_name[names["temperature"]].id, by_name[setpoint].id if setpoint else None)
+    return DeviceProfile(
+        model=model,
+        command_name=config.command_name,
+        attributes=attributes,
+        entities=tuple(entities),
+        by_id={a.id: a for a in attributes},
+        by_name=by_name,
+        by_platform=by_platform,
+        compartments=compartments,
+    )
@@ -0,0 +1,67 @@
+"""
+Deduplication of concurrent blocking calls.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class _Call(object):
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.expires = 0.0
+
+
+class SingleFlight(object):
+    """Run one call per key at a time and share its outcome.
+
+    Callers arriving while a call for the same key is in flight wait for it
+    and get its result or exception. A successful result keeps being returned
+    for `ttl` seconds after the call completed.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None or (call.done.is_set() and call.expires <= time.monotonic()):
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            call.expires = time.monotonic() + self._ttl
+        finally:
+            call.done.set()
+            if call.error is not None:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+        return call.result
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a cached result so the next call goes out again."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set():
+                del self._calls[key]
@@ -0,0 +1,65 @@
+"""
+Websocket traffic accounting per device.
+
+websocket-client does not implement permessage-deflate (RFC 7692), frames
+with the compression bit set are rejected, so the socket stays
+uncompressed. `deflate_size` tells what negotiating it would save on
+recorded traffic.
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from typing import Iterable
+
+# frames that could not be routed to a device
+UNKNOWN_DEVICE = "unknown"
+
+
+class TrafficCounters(object):
+    """Thread safe frame and payload byte counters by device and direction."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # device id -> [in frames, in bytes, out frames, out bytes]
+        self._counters: dict[str, list[int]] = {}
+
+    def count(self, device_id: str | None, direction: str, data: str | bytes) -> None:
+        size = len(data.encode("utf-8") if isinstance(data, str) else data)
+        offset = 0 if direction == "in" else 2
+        with self._lock:
+            counters = self._counters.get(device_id or UNKNOWN_DEVICE)
+            if counters is None:
+                counters = self._counters[device_id or UNKNOWN_DEVICE] = [0, 0, 0, 0]
+            counters[offset] += 1
+            counters[offset + 1] += size
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                device_id: {
+                    "in_frames": counters[0],
+                    "in_bytes": counters[1],
+                    "out_frames": counters[2],
+                    "out_bytes": counters[3],
+                }
+                for device_id, counters in self._counters.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+def deflate_size(frames: Iterable[str | bytes], context_takeover: bool = True) -> int:
+    """Payload bytes of `frames` sent as permessage-deflate messages."""
+    size = 0
+    compressor = None
+    for frame in frames:
+        if compressor is None or not context_takeover:
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        data = frame.encode("utf-8") if isinstance(frame, str) else frame
+        # every message ends with an empty stored block, sent without its 4 trailing bytes
+        size += len(compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+    return size
@@ -2,8 +2,9 @@
 Config parser for Haier Evo devices.
 """
 
+from functools import lru_cache
 from os.path import dirname, exists, join
-from homeassistant.util.yaml import load_yaml
+import yaml
 from .logger import _LOGGER
 from . import devices as config_dir
 
@@ -20,9 +21,26 @@ class DeviceConfig(object):
         filename = join(_CONFIG_DIR, fname) + '.yaml'
         if not exists(filename):
             filename = join(_CONFIG_DIR, 'default') + '.yaml'
-        self._config = load_yaml(filename)
+        with open(filename, encoding="utf-8") as f:
+            self._config = yaml.safe_load(f)
         _LOGGER.debug("Loaded device config %s", fname)
 
+    @property
+    def attributes(self) -> list[dict]:
+        return self._config.get('attributes', [])
+
+    @property
+    def entities(self) -> list[dict]:
+        return self._config.get('entities', [])
+
+    @property
+    def compartments(self) -> dict[str, dict]:
+        return self._config.get('compartments', {})
+
+    @property
+    def command_name(self) -> str | None:
+        return self._config.get('command_name')
+
     def get_command_name(self) -> str:
         return self._config['command_name']
 
@@ -70,3 +88,9 @@ class DeviceConfig(object):
                     if mapping.get('value') == value:
                         return mapping.get('haier')
         return None
+
+
+@lru_cache(maxsize=None)
+def get_device_config(fname: str) -> DeviceConfig:
+    """Return the device config for a model, loading its yaml only once."""
+    return DeviceConfig(fname)
@@ -0,0 +1,24 @@
+"""Diagnostics support for Haier Evo Fridge."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    haier = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "socket_status": haier.socket_status.name,
+        "devices": len(haier.devices),
+        "executor": haier.executor.stats,
+        "traffic": haier.traffic.snapshot(),
+        "thermal": [
+            {**device.thermal.as_dict(), "anomalies": sorted(device.thermal.anomalies)}
+            for device in haier.devices
+        ],
+    }
@@ -0,0 +1,153 @@
+"""
+Per-account connection sharing between config entries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from datetime import datetime, timedelta
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from .core.logger import _LOGGER
+from .core import api
+from . import const as C # noqa
+
+
+class HaierHub(object):
+    """One authenticated Haier connection, reference-counted by config entries."""
+
+    def __init__(self, haier: api.Haier) -> None:
+        self.haier = haier
+        self.entry_ids: set[str] = set()
+        # entry creating the entities, it stays the owner while it reloads
+        self.owner: str | None = None
+        self.cancel_analysis: CALLBACK_TYPE | None = None
+
+    async def async_analyze(self, hass: HomeAssistant, now: datetime | None = None) -> None:
+        """Run the thermal analysis of all devices and fire events for new anomalies."""
+        appeared = await self.haier.executor.async_run(self.haier.analyze_thermal)
+        for device, anomalies in appeared:
+            for anomaly in sorted(anomalies):
+                _LOGGER.warning("Thermal anomaly %s on device %s", anomaly, device.device_id)
+                hass.bus.async_fire(C.EVENT_THERMAL_ANOMALY, {
+                    "mac": device.device_mac,
+                    "name": device.device_name,
+                    "anomaly": anomaly,
+                    **device.thermal.as_dict(),
+                })
+
+
+def _get_lock(hass: HomeAssistant) -> asyncio.Lock:
+    return hass.data.setdefault(C.DATA_HUBS_LOCK, asyncio.Lock())
+
+
+def async_hand_off(hass: HomeAssistant, haier: api.Haier) -> None:
+    """Keep a connection the config flow logged in and discovered with for the entry it creates."""
+    handoff: dict[str, tuple[api.Haier, CALLBACK_TYPE]] = hass.data.setdefault(C.DATA_HANDOFF, {})
+    key = haier.account_id
+
+    async def _async_expire(now: datetime) -> None:
+        if key in handoff and handoff[key][0] is haier:
+            handoff.pop(key)
+            _LOGGER.debug("No entry took the connection of account %s, closing it", key)
+            await haier.executor.async_run(haier.close)
+
+    previous = handoff.pop(key, None)
+    if previous is not None:
+        previous[1]()
+        hass.async_create_task(previous[0].executor.async_run(previous[0].close))
+    handoff[key] = (haier, async_call_later(hass, C.HANDOFF_TIMEOUT, _async_expire))
+
+
+def _take_handed_off(hass: HomeAssistant, key: str) -> api.Haier | None:
+    handoff: dict[str, tuple[api.Haier, CALLBACK_TYPE]] = hass.data.get(C.DATA_HANDOFF, {})
+    if key not in handoff:
+        return None
+    haier, cancel_expire = handoff.pop(key)
+    cancel_expire()
+    return haier
+
+
+async def async_acquire(hass: HomeAssistant, entry: ConfigEntry) -> api.Haier:
+    """Return the account connection for an entry, creating it for the first entry."""
+    hubs: dict[str, HaierHub] = hass.data.setdefault(C.DATA_HUBS, {})
+    key = api.account_id(entry.data["email"])
+    async with _get_lock(hass):
+        hub = hubs.get(key)
+        if hub is None:
+            haier = _take_handed_off(hass, key)
+            if haier is not None:
+                # logged in and discovered by the config flow moments ago
+                _LOGGER.debug("Entry %s takes over the config flow connection of account %s", entry.entry_id, key)
+                if haier.devices:
+                    haier.connect_in_thread()
+            else:
+                haier = api.Haier(entry.data["email"], entry.data["password"], hass.config.path())
+                try:
+                    await haier.executor.async_run(haier.load_tokens)
+                    await haier.executor.async_run(haier.pull_data)
+                except Exception:
+                    await haier.executor.async_run(haier.close)
+                    raise
+            hub = hubs[key] = HaierHub(haier)
+            hub.cancel_analysis = async_track_time_interval(
+                hass,
+                functools.partial(hub.async_analyze, hass),
+                timedelta(seconds=C.ANALYSIS_INTERVAL),
+            )
+        else:
+            _LOGGER.debug("Sharing connection of account %s with entry %s", key, entry.entry_id)
+            unused = _take_handed_off(hass, key)
+            if unused is not None:
+                await unused.executor.async_run(unused.close)
+        hub.entry_ids.add(entry.entry_id)
+        if hub.owner is None:
+            hub.owner = entry.entry_id
+        return hub.haier
+
+
+def owned_devices(hass: HomeAssistant, entry: ConfigEntry) -> list[api.HaierFridge]:
+    """Devices an entry creates entities for, entries sharing a connection would duplicate them."""
+    hub: HaierHub = hass.data[C.DATA_HUBS][api.account_id(entry.data["email"])]
+    return list(hub.haier.devices) if hub.owner == entry.entry_id else []
+
+
+@callback
+def async_pass_ownership(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Let another entry of the account create the entities once the owner is removed or disabled."""
+    hub: HaierHub | None = hass.data.get(C.DATA_HUBS, {}).get(api.account_id(entry.data["email"]))
+    if hub is None or hub.owner != entry.entry_id:
+        return
+    hub.owner = min(hub.entry_ids, default=None)
+    if hub.owner is None:
+        return
+    _LOGGER.debug("Entry %s takes over the entities of account %s", hub.owner, hub.haier.account_id)
+    # move the registry entries so removing or disabling the old owner leaves them alone
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        entity_registry.async_update_entity(entity.entity_id, config_entry_id=hub.owner)
+    device_registry = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        device_registry.async_update_device(
+            device.id, add_config_entry_id=hub.owner, remove_config_entry_id=entry.entry_id,
+        )
+    hass.config_entries.async_schedule_reload(hub.owner)
+
+
+async def async_release(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Release an entry's account connection, disconnecting after the last entry."""
+    hubs: dict[str, HaierHub] = hass.data.setdefault(C.DATA_HUBS, {})
+    key = api.account_id(entry.data["email"])
+    async with _get_lock(hass):
+        hub = hubs.get(key)
+        if hub is None:
+            return
+        hub.entry_ids.discard(entry.entry_id)
+        if not hub.entry_ids:
+            hubs.pop(key)
+            if hub.cancel_analysis is not None:
+                hub.cancel_analysis()
+            await hub.haier.executor.async_run(hub.haier.close)
@@ -1,6 +0,0 @@
-
-import logging
-
-
-_LOGGER = logging.getLogger("custom_components.haier_evo_fridge")
-_LOGGER.setLevel(logging.INFO)
@@ -7,19 +7,10 @@ from homeassistant.components.number import (
     NumberMode,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HaierFridgeEntity
-from .const import (
-    DOMAIN,
-    MIN_FRIDGE_TEMP,
-    MAX_FRIDGE_TEMP,
-    MIN_FREEZER_TEMP,
-    MAX_FREEZER_TEMP,
-)
+from . import HaierFridgeAttributeEntity, hub
 
 
 async def async_setup_entry(
@@ -28,50 +19,37 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Haier Evo Fridge number platform."""
-    device = hass.data[DOMAIN][config_entry.entry_id]
-
-    entities = [
-        HaierFridgeTemperatureControl(device, "fridge", "Fridge Temperature Control"),
-        HaierFridgeTemperatureControl(device, "freezer", "Freezer Temperature Control"),
-    ]
+    async_add_entities(
+        HaierFridgeNumber(device, descriptor)
+        for device in hub.owned_devices(hass, config_entry)
+        for descriptor in device.profile.entities_for("number")
+    )
 
-    async_add_entities(entities)
 
+class HaierFridgeNumber(HaierFridgeAttributeEntity, NumberEntity):
+    """Haier Evo Fridge control described by the device profile."""
 
-class HaierFridgeTemperatureControl(HaierFridgeEntity, NumberEntity):
-    """Haier Evo Fridge temperature control."""
-
-    _attr_device_class = NumberDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_entity_category = EntityCategory.CONFIG
     _attr_mode = NumberMode.SLIDER
 
-    def __init__(self, device, control_type, name) -> None:
+    def __init__(self, device, descriptor) -> None:
         """Initialize the control."""
-        super().__init__(device)
-        self._control_type = control_type
-        self._attr_name = f"{name}"
-        self._attr_unique_id = f"{self._device.unique_id}_{control_type}_temperature_control"
-
-        if control_type == "fridge":
-            self._attr_native_min_value = MIN_FRIDGE_TEMP
-            self._attr_native_max_value = MAX_FRIDGE_TEMP
-            self._attr_native_step = 1.0
-        else:  # freezer
-            self._attr_native_min_value = MIN_FREEZER_TEMP
-            self._attr_native_max_value = MAX_FREEZER_TEMP
-            self._attr_native_step = 1.0
+        super().__init__(device, descriptor)
+        attribute = descriptor.attribute
+        if descriptor.device_class is not None:
+            self._attr_device_class = NumberDeviceClass(descriptor.device_class)
+        self._attr_native_unit_of_measurement = descriptor.unit
+        if attribute.min is not None:
+            self._attr_native_min_value = attribute.min
+        if attribute.max is not None:
+            self._attr_native_max_value = attribute.max
+        if attribute.step is not None:
+            self._attr_native_step = attribute.step
 
     @property
     def native_value(self) -> float | None:
-        """Return the current temperature setting."""
-        if self._control_type == "fridge":
-            return self._device.fridge_target_temperature
-        return self._device.freezer_target_temperature
+        """Return the current setting."""
+        return self._device.values.get(self._attribute_id)
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set new target temperature."""
-        if self._control_type == "fridge":
-            await self._device.async_set_fridge_temperature(int(value))
-        else:
-            await self._device.async_set_freezer_temperature(int(value))
+        """Set a new value."""
+        await self._device.async_set_value(self._descriptor.attribute.name, value)
@@ -1,19 +1,90 @@
 """Support for Haier Evo Fridge sensors."""
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Callable
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import UnitOfTime
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HaierFridgeEntity
-from .const import DOMAIN
+from . import HaierFridgeAttributeEntity, HaierFridgeEntity, hub
+from .core.analysis import ThermalState
+from .core.profile import DeviceProfile
+
+
+def _has_temperature(compartment: str) -> Callable[[DeviceProfile], bool]:
+    return lambda profile: compartment in profile.compartments
+
+
+def _has_setpoint(compartment: str) -> Callable[[DeviceProfile], bool]:
+    return lambda profile: profile.compartments.get(compartment, (None, None))[1] is not None
+
+
+@dataclass(frozen=True)
+class ThermalSensorDescriptor:
+    """A sensor showing one result of the thermal analysis."""
+
+    key: str
+    name: str
+    value_fn: Callable[[ThermalState], float | None]
+    unit: str
+    device_class: str | None = None
+    category: str | None = "diagnostic"
+    icon: str | None = None
+    # whether the profile measures what the result is computed from
+    supported_fn: Callable[[DeviceProfile], bool] = lambda profile: True
+
+
+THERMAL_SENSORS = (
+    ThermalSensorDescriptor(
+        key="fridge_temperature_trend",
+        name="Fridge Temperature Trend",
+        value_fn=lambda state: state.fridge_rise_rate,
+        unit="°C/h",
+        icon="mdi:thermometer-chevron-up",
+        supported_fn=_has_temperature("fridge"),
+    ),
+    ThermalSensorDescriptor(
+        key="freezer_temperature_trend",
+        name="Freezer Temperature Trend",
+        value_fn=lambda state: state.freezer_rise_rate,
+        unit="°C/h",
+        icon="mdi:thermometer-chevron-up",
+        supported_fn=_has_temperature("freezer"),
+    ),
+    ThermalSensorDescriptor(
+        key="fridge_setpoint_deviation",
+        name="Fridge Setpoint Deviation",
+        value_fn=lambda state: state.fridge_deviation,
+        unit="°C",
+        icon="mdi:thermometer-alert",
+        supported_fn=_has_setpoint("fridge"),
+    ),
+    ThermalSensorDescriptor(
+        key="freezer_setpoint_deviation",
+        name="Freezer Setpoint Deviation",
+        value_fn=lambda state: state.freezer_deviation,
+        unit="°C",
+        icon="mdi:thermometer-alert",
+        supported_fn=_has_setpoint("freezer"),
+    ),
+    ThermalSensorDescriptor(
+        key="compressor_cycle_period",
+        name="Compressor Cycle Period",
+        value_fn=lambda state: state.compressor_cycle_period,
+        unit=UnitOfTime.MINUTES,
+        device_class=SensorDeviceClass.DURATION,
+        icon="mdi:sine-wave",
+        supported_fn=lambda profile: bool(profile.compartments),
+    ),
+)
 
 
 async def async_setup_entry(
@@ -22,39 +93,53 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Haier Evo Fridge sensor platform."""
-    device = hass.data[DOMAIN][config_entry.entry_id]
+    devices = hub.owned_devices(hass, config_entry)
 
-    entities = [
-        HaierFridgeTemperatureSensor(device, "fridge", "Fridge Temperature"),
-        HaierFridgeTemperatureSensor(device, "freezer", "Freezer Temperature"),
-        HaierFridgeTemperatureSensor(device, "ambient", "Ambient Temperature"),
-    ]
+    async_add_entities(
+        HaierFridgeSensor(device, descriptor)
+        for device in devices
+        for descriptor in device.profile.entities_for("sensor")
+    )
+    async_add_entities(
+        HaierFridgeThermalSensor(device, descriptor)
+        for device in devices
+        for descriptor in THERMAL_SENSORS
+        if descriptor.supported_fn(device.profile)
+    )
 
-    async_add_entities(entities)
 
+class HaierFridgeSensor(HaierFridgeAttributeEntity, SensorEntity):
+    """Haier Evo Fridge sensor described by the device profile."""
 
-class HaierFridgeTemperatureSensor(HaierFridgeEntity, SensorEntity):
-    """Haier Evo Fridge temperature sensor."""
+    def __init__(self, device, descriptor) -> None:
+        """Initialize the sensor."""
+        super().__init__(device, descriptor)
+        if descriptor.device_class is not None:
+            self._attr_device_class = SensorDeviceClass(descriptor.device_class)
+        if descriptor.state_class is not None:
+            self._attr_state_class = SensorStateClass(descriptor.state_class)
+        self._attr_native_unit_of_measurement = descriptor.unit
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self._device.values.get(self._attribute_id)
+
+
+class HaierFridgeThermalSensor(HaierFridgeEntity, SensorEntity):
+    """Haier Evo Fridge sensor derived from the temperature history."""
 
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    def __init__(self, device, sensor_type, name) -> None:
+    def __init__(self, device, descriptor: ThermalSensorDescriptor) -> None:
         """Initialize the sensor."""
-        super().__init__(device)
-        self._sensor_type = sensor_type
-        self._attr_name = f"{name}"
-        self._attr_unique_id = f"{self._device.unique_id}_{sensor_type}_temperature"
+        super().__init__(device, descriptor)
+        if descriptor.device_class is not None:
+            self._attr_device_class = SensorDeviceClass(descriptor.device_class)
+        self._attr_native_unit_of_measurement = descriptor.unit
+        self._value_fn = descriptor.value_fn
 
     @property
     def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        if self._sensor_type == "fridge":
-            return self._device.fridge_temperature
-        elif self._sensor_type == "freezer":
-            return self._device.freezer_temperature
-        elif self._sensor_type == "ambient":
-            return self._device.ambient_temperature
-        return None
+        """Return the latest analysis result."""
+        return self._value_fn(self._device.thermal)
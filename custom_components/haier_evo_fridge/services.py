@@ -0,0 +1,68 @@
+"""
+Haier Evo Fridge services.
+"""
+
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from .core.api import HaierError, HaierFridge
+from . import const as C # noqa
+
+SET_ATTRIBUTES_SCHEMA = vol.Schema({
+    vol.Required("device_id"): cv.string,
+    vol.Required("attributes"): vol.All(dict, vol.Length(min=1)),
+})
+
+
+def _haier_objects(hass: HomeAssistant) -> list:
+    return [hub.haier for hub in hass.data.get(C.DATA_HUBS, {}).values()]
+
+
+def _get_device(hass: HomeAssistant, device_id: str) -> HaierFridge:
+    """Return the fridge of a device registry entry."""
+    entry = dr.async_get(hass).async_get(device_id)
+    if entry is not None:
+        unique_ids = {identifier for domain, identifier in entry.identifiers if domain == C.DOMAIN}
+        for haier in _haier_objects(hass):
+            for device in haier.devices:
+                if device.unique_id in unique_ids:
+                    return device
+    raise HomeAssistantError(f"Unknown Haier Evo device {device_id}")
+
+
+async def async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration services once for all entries."""
+    if hass.services.has_service(C.DOMAIN, C.SERVICE_START_CAPTURE):
+        return
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        for haier in _haier_objects(hass):
+            await haier.executor.async_run(haier.start_capture)
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        for haier in _haier_objects(hass):
+            await haier.executor.async_run(haier.stop_capture)
+
+    async def async_set_attributes(call: ServiceCall) -> ServiceResponse:
+        device = _get_device(hass, call.data["device_id"])
+        try:
+            batch = await device.async_set_values(call.data["attributes"])
+        except HaierError as e:
+            raise HomeAssistantError(str(e)) from e
+        if batch.queued:
+            # sent once the websocket reopens, an ack cannot arrive before that
+            return {"status": "queued"}
+        if not await batch.async_wait(C.COMMAND_ACK_TIMEOUT):
+            raise HomeAssistantError(f"Device {device.device_id} did not confirm the commands")
+        return {"status": "confirmed"}
+
+    hass.services.async_register(C.DOMAIN, C.SERVICE_START_CAPTURE, async_start_capture)
+    hass.services.async_register(C.DOMAIN, C.SERVICE_STOP_CAPTURE, async_stop_capture)
+    hass.services.async_register(
+        C.DOMAIN, C.SERVICE_SET_ATTRIBUTES, async_set_attributes,
+        schema=SET_ATTRIBUTES_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,76 @@
+"""
+Replay a websocket capture through the Haier Evo client and time it.
+
+Devices are taken from the capture and served by the in-process cloud of
+the soak harness, so no credentials or network are needed. Prints the bytes
+each device received and what permessage-deflate would have made of them.
+
+    python scripts/replay.py haier_evo_fridge_capture_0123456789abcdef.jsonl.gz --speed 0
+    python scripts/replay.py capture.jsonl.gz --speed 0 --profile
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from soak import EMAIL, SoakCloud, SoakWebSocketApp, capture_macs
+from core import api, capture, traffic
+
+
+def report_bandwidth(path: str, counters: dict[str, dict[str, int]]) -> None:
+    """Inbound bytes per device, raw and as permessage-deflate with and without context takeover."""
+    frames: dict[str, list[str]] = {}
+    for record in capture.read_capture(path):
+        if record.get("dir") == "in":
+            device_id = json.loads(record["data"]).get("macAddress") or traffic.UNKNOWN_DEVICE
+            frames.setdefault(device_id, []).append(record["data"])
+    print(f"{'device':20s} {'frames':>8s} {'bytes':>12s} {'deflate':>13s} {'no takeover':>13s}")
+    for device_id, device_frames in frames.items():
+        received = counters.get(device_id, {}).get("in_bytes", 0)
+        takeover = traffic.deflate_size(device_frames)
+        no_takeover = traffic.deflate_size(device_frames, context_takeover=False)
+        print(
+            f"{device_id:20s} {len(device_frames):8d} {received:12d} "
+            f"{takeover:8d} {takeover / max(received, 1):4.0%} {no_takeover:8d} {no_takeover / max(received, 1):4.0%}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="capture file recorded with the start_capture service")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 for real time, N for N times faster, 0 for max")
+    parser.add_argument("--profile", action="store_true", help="print the top functions by cumulative time")
+    args = parser.parse_args()
+
+    cloud = SoakCloud(capture_macs(args.capture))
+    with tempfile.TemporaryDirectory() as config_dir, \
+            mock.patch.object(api, "WebSocketApp", SoakWebSocketApp), \
+            mock.patch.object(api.requests, "request", cloud.request), \
+            mock.patch.object(api.requests, "get", cloud.get):
+        haier = api.Haier(EMAIL, "password", config_dir)
+        haier.pull_data()
+        profiler = cProfile.Profile() if args.profile else None
+        started = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        frames = capture.replay(haier, args.capture, args.speed)
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+        haier.close()
+    print(f"{frames} frames for {len(cloud.macs)} devices in {elapsed:.3f}s ({frames / elapsed:.0f} frames/s)")
+    report_bandwidth(args.capture, haier.traffic.snapshot())
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Soak test for the Haier Evo client.
+
+Replays websocket traffic through Haier/HaierFridge at accelerated speed,
+forcing socket drops and full close/reconnect cycles along the way, and
+samples traced memory, thread count and open file descriptors. Fails when
+any of them grows beyond its threshold between the start and the end of
+the run.
+
+The cloud is simulated in-process: REST calls get canned responses and the
+websocket is replaced by an in-memory socket, so no credentials, network or
+Home Assistant are needed. Traffic comes from a capture recorded with the start_capture
+service or, without one, is synthesized.
+
+    python scripts/soak.py --hours 6 --speed 600
+    python scripts/soak.py --capture fridge.jsonl.gz --speed 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import os
+import queue
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components" / "haier_evo_fridge"))
+
+from core import api, capture  # noqa: E402
+from websocket import WebSocketConnectionClosedException  # noqa: E402
+
+
+EMAIL = "soak@example.com"
+TOKEN_EXPIRE = "2099-01-01T00:00:00+0300"
+# the simulated cloud has no rate limit, the client's limiter would only stall the accelerated run
+UNLIMITED_MAKE_REQUEST = inspect.unwrap(api.Haier.make_request)
+
+
+class SoakWebSocketApp(object):
+    """In-memory stand-in for websocket.WebSocketApp, frames are pushed by the driver."""
+
+    def __init__(self, url: str, on_message=None, on_open=None, on_close=None, **kwargs) -> None:
+        self.url = url
+        self._on_message = on_message
+        self._on_open = on_open
+        self._on_close = on_close
+        # bounded so a driver outrunning the client measures the client, not a backlog
+        self._frames: queue.Queue = queue.Queue(maxsize=1000)
+        self._open = False
+        self.sent = 0
+
+    def run_forever(self, **kwargs) -> None:
+        self._open = True
+        self._on_open(self)
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                break
+            self._on_message(self, frame)
+        self._open = False
+        self._on_close(self, 1000, "closed")
+
+    def send(self, payload: str, *args) -> None:
+        if not self._open:
+            raise WebSocketConnectionClosedException("socket is already closed.")
+        self.sent += 1
+
+    def push(self, frame: str) -> bool:
+        try:
+            self._frames.put(frame, timeout=1)
+        except queue.Full:
+            return False
+        return True
+
+    def close(self, **kwargs) -> None:
+        self._frames.put(None)
+
+
+class SoakCloud(object):
+    """Canned REST responses for login, device discovery and device status."""
+
+    def __init__(self, macs: list[str]) -> None:
+        self.macs = macs
+        # macs listed per smartHome partition, all in the first one unless set
+        self.partitions: dict[int, list[str]] | None = None
+        self.calls = 0
+
+    @staticmethod
+    def _response(data: dict, status_code: int = 200) -> mock.Mock:
+        text = json.dumps(data)
+        resp = mock.Mock(status_code=status_code, text=text, headers={"content-type": "application/json"})
+        resp.json.side_effect = lambda: json.loads(text)
+        resp.raise_for_status.return_value = None
+        return resp
+
+    def request(self, method: str, url: str, **kwargs) -> mock.Mock:
+        self.calls += 1
+        if url.endswith((api.C.API_LOGIN, api.C.API_TOKEN_REFRESH)):
+            return self._response({"data": {"token": {
+                "accessToken": "soak-token",
+                "expire": TOKEN_EXPIRE,
+                "refreshToken": "soak-refresh",
+                "refreshExpire": TOKEN_EXPIRE,
+            }}})
+        if "smartHome" in url:
+            part = int(parse_qs(urlparse(url).query)["part"][0])
+            partitions = self.partitions if self.partitions is not None else {1: self.macs}
+            if not partitions.get(part):
+                return self._response({"data": {}})
+            items = [{
+                "title": f"Fridge {i}",
+                "action": {"link": f"haierevo://device?deviceId={mac}&type=REF&serialNum=SOAK{i}"},
+            } for i, mac in enumerate(partitions[part])]
+            return self._response({"data": {"presentation": {"layout": {"scrollContainer": [{
+                "contractName": "deviceList",
+                "state": json.dumps({"items": items}),
+            }]}}}})
+        return self._response({
+            "info": {"model": "BCF3261WRU"},
+            "settings": {"firmware": {"value": "soak"}},
+            "attributes": [
+                {"name": api.C.ATTR_FRIDGE_TEMP, "currentValue": "4"},
+                {"name": api.C.ATTR_FREEZER_TEMP, "currentValue": "-18"},
+                {"name": api.C.ATTR_FRIDGE_DOOR, "currentValue": "0"},
+            ],
+        })
+
+
+def read_capture(path: str) -> list[tuple[float, str]]:
+    """Inbound frames of a capture file as (seconds from start, frame) pairs."""
+    frames = [(r["t"], r["data"]) for r in capture.read_capture(path) if r.get("dir") == "in"]
+    if not frames:
+        raise SystemExit(f"No inbound frames in {path}")
+    start = frames[0][0]
+    return [(t - start, frame) for t, frame in frames]
+
+
+def capture_macs(path: str) -> list[str]:
+    macs = []
+    for record in capture.read_capture(path):
+        if record.get("dir") == "in":
+            mac = json.loads(record["data"]).get("macAddress")
+            if mac and mac not in macs:
+                macs.append(mac)
+    return macs
+
+
+def synthesize_traffic(macs: list[str], interval: float, length: float) -> list[tuple[float, str]]:
+    """Status frames for every device each `interval` seconds, with door openings."""
+    rnd = random.Random(0)
+    frames = []
+    t = 0.0
+    while t < length:
+        for mac in macs:
+            properties = {
+                api.C.ATTR_FRIDGE_TEMP: str(rnd.randint(2, 6)),
+                api.C.ATTR_FREEZER_TEMP: str(rnd.randint(-20, -16)),
+                api.C.ATTR_AMBIENT_TEMP: str(rnd.randint(20, 26)),
+                api.C.ATTR_FRIDGE_DOOR: "1" if rnd.random() < 0.05 else "0",
+            }
+            frames.append((t, json.dumps({
+                "event": "status",
+                "macAddress": mac,
+                "payload": {"statuses": [{"properties": properties}]},
+            })))
+        t += interval
+    return frames
+
+
+def open_fds() -> tuple[int, int]:
+    """Open file descriptors and how many of them are sockets."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return -1, -1
+    sockets = 0
+    for fd in fds:
+        try:
+            sockets += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            pass
+    return len(fds), sockets
+
+
+class Soak(object):
+
+    def __init__(self, args: argparse.Namespace, config_dir: str, macs: list[str]) -> None:
+        self.args = args
+        self.config_dir = config_dir
+        self.macs = macs
+        self.haier: api.Haier | None = None
+        self.samples: list[tuple[float, int, int, int, int]] = []
+        self.frames_sent = 0
+        self.disconnects = 0
+        self.reloads = 0
+        self._done = threading.Event()
+
+    def start_client(self) -> None:
+        haier = api.Haier(EMAIL, "password", self.config_dir)
+        haier.load_tokens()
+        haier.pull_data()
+        self.haier = haier
+
+    def push(self, frame: str) -> None:
+        app = self.haier._socket_app if self.haier is not None else None
+        if isinstance(app, SoakWebSocketApp) and app.push(frame):
+            self.frames_sent += 1
+
+    def drive(self, traffic: list[tuple[float, str]]) -> None:
+        """Feed the traffic, looping it until the simulated run length is reached."""
+        args = self.args
+        length = args.hours * 3600
+        period = traffic[-1][0] + (args.frame_interval or 1.0)
+        next_disconnect = args.disconnect_every
+        next_reload = args.reload_every
+        started = time.monotonic()
+        offset = 0.0
+        while not self._done.is_set():
+            for t, frame in traffic:
+                now = offset + t
+                if now >= length:
+                    self._done.set()
+                    return
+                if args.speed > 0:
+                    delay = started + now / args.speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                if args.disconnect_every and now >= next_disconnect:
+                    app = self.haier._socket_app
+                    if app is not None:
+                        app.close()  # dropped by the server, the client reconnects by itself
+                        self.disconnects += 1
+                    next_disconnect += args.disconnect_every
+                if args.reload_every and now >= next_reload:
+                    self.haier.close()
+                    self.start_client()
+                    self.reloads += 1
+                    next_reload += args.reload_every
+                self.push(frame)
+            offset += period
+
+    def sample(self) -> None:
+        fds, sockets = open_fds()
+        self.samples.append((
+            time.monotonic(),
+            tracemalloc.get_traced_memory()[0],
+            threading.active_count(),
+            fds,
+            sockets,
+        ))
+
+    def run(self, traffic: list[tuple[float, str]]) -> bool:
+        tracemalloc.start()
+        self.start_client()
+        driver = threading.Thread(target=self.drive, args=(traffic,), name="soak_driver", daemon=True)
+        driver.start()
+        self.sample()
+        while not self._done.wait(self.args.sample_interval):
+            self.haier.analyze_thermal()
+            self.sample()
+            self.report(self.samples[-1])
+        driver.join()
+        self.haier.close()
+        time.sleep(self.args.sample_interval)  # let the closed threads exit
+        self.sample()
+        self.report(self.samples[-1])
+        return self.verdict()
+
+    def report(self, sample: tuple[float, int, int, int, int]) -> None:
+        elapsed = sample[0] - self.samples[0][0]
+        print(
+            f"{elapsed:8.1f}s  mem {sample[1] / 1024:10.1f} KiB  threads {sample[2]:3d}  "
+            f"fds {sample[3]:4d}  sockets {sample[4]:3d}  frames {self.frames_sent:8d}  "
+            f"disconnects {self.disconnects:5d}  reloads {self.reloads:4d}",
+            flush=True,
+        )
+
+    def verdict(self) -> bool:
+        """Compare the median of the first and last quarter of the samples after warm-up."""
+        samples = self.samples[int(len(self.samples) * self.args.warmup):]
+        if len(samples) < 8:
+            print("Not enough samples for a verdict, run longer or sample more often")
+            return False
+        quarter = len(samples) // 4
+        ok = True
+        for index, name, limit in (
+            (1, "memory (KiB)", self.args.max_memory_growth),
+            (2, "threads", self.args.max_thread_growth),
+            (3, "file descriptors", self.args.max_fd_growth),
+            (4, "sockets", self.args.max_fd_growth),
+        ):
+            scale = 1024 if index == 1 else 1
+            first = statistics.median(s[index] for s in samples[:quarter]) / scale
+            last = statistics.median(s[index] for s in samples[-quarter:]) / scale
+            growth = last - first
+            failed = growth > limit
+            ok = ok and not failed
+            print(f"{'FAIL' if failed else 'ok':4s}  {name}: {first:.1f} -> {last:.1f} (limit +{limit})")
+        return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capture", help="capture file to replay instead of synthetic traffic")
+    parser.add_argument("--hours", type=float, default=6.0, help="simulated run length")
+    parser.add_argument("--speed", type=float, default=600.0, help="simulated seconds per second, 0 for max")
+    parser.add_argument("--devices", type=int, default=2, help="devices in synthetic traffic")
+    parser.add_argument("--frame-interval", type=float, default=10.0, help="seconds between synthetic frames")
+    parser.add_argument("--disconnect-every", type=float, default=300.0, help="simulated seconds, 0 to disable")
+    parser.add_argument("--reload-every", type=float, default=3600.0, help="simulated seconds, 0 to disable")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="wall seconds between samples")
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of samples ignored")
+    parser.add_argument("--max-memory-growth", type=float, default=2048.0, help="KiB")
+    parser.add_argument("--max-thread-growth", type=float, default=2.0)
+    parser.add_argument("--max-fd-growth", type=float, default=4.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        if args.capture:
+            soak = Soak(args, config_dir, capture_macs(args.capture))
+            traffic = read_capture(args.capture)
+        else:
+            soak = Soak(args, config_dir, [f"00:00:00:00:00:{i:02x}" for i in range(args.devices)])
+            traffic = synthesize_traffic(soak.macs, args.frame_interval, args.hours * 3600)
+        cloud = SoakCloud(soak.macs)
+        with mock.patch.object(api, "WebSocketApp", SoakWebSocketApp), \
+                mock.patch.object(api.Haier, "make_request", UNLIMITED_MAKE_REQUEST), \
+                mock.patch.object(api.requests, "request", cloud.request):
+            ok = soak.run(traffic)
+        print(f"REST calls: {cloud.calls}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
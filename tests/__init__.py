@@ -0,0 +1 @@
+"""Tests for the Haier Evo Fridge integration."""
@@ -0,0 +1,45 @@
+"""Fixtures for Haier Evo Fridge tests."""
+from __future__ import annotations
+
+import inspect
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from soak import SoakCloud, SoakWebSocketApp  # noqa: E402
+
+from custom_components.haier_evo_fridge.core import api  # noqa: E402
+
+MAC = "00:00:00:00:00:01"
+
+
+class DownWebSocketApp(object):
+    """Socket that fails to connect, websocket-client then only calls on_close."""
+
+    def __init__(self, url: str, on_close=None, **kwargs) -> None:
+        self._on_close = on_close
+
+    def run_forever(self, **kwargs) -> None:
+        self._on_close(self, None, None)
+
+    def close(self, **kwargs) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+def cloud():
+    """Serve REST calls and the websocket in-process without rate limit, like the soak harness."""
+    cloud = SoakCloud([MAC])
+    with mock.patch.object(api, "WebSocketApp", SoakWebSocketApp), \
+            mock.patch.object(api.Haier, "make_request", inspect.unwrap(api.Haier.make_request)), \
+            mock.patch.object(api.requests, "request", cloud.request):
+        yield cloud
@@ -0,0 +1,75 @@
+"""Thermal analysis of the temperature history."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from custom_components.haier_evo_fridge.core import analysis
+from custom_components.haier_evo_fridge.core import const as C
+
+HOURS = 6
+SETPOINT = -18.0
+
+
+def _history(freezer, fridge=None, freezer_target=SETPOINT) -> tuple[analysis.TemperatureHistory, float]:
+    """History of the freezer temperature `freezer(t)` sampled every analysis step, and its end."""
+    history = analysis.TemperatureHistory()
+    end = HOURS * 3600
+    for t in range(0, end + 1, C.ANALYSIS_STEP):
+        history.record(t, fridge, freezer(t), None, freezer_target)
+    return history, end
+
+
+def _analyze(history: analysis.TemperatureHistory, now: float, door_open: bool = False) -> analysis.ThermalState:
+    return analysis.analyze([history], [door_open], now)[0]
+
+
+def test_ramp_rise_rate() -> None:
+    history, now = _history(lambda t: SETPOINT + 0.5 * t / 3600)
+    state = _analyze(history, now)
+    assert state.freezer_rise_rate == pytest.approx(0.5)
+    assert state.anomalies == frozenset()
+
+
+def test_fast_ramp_is_warming_unless_the_door_is_open() -> None:
+    history, now = _history(lambda t: SETPOINT + 2 * (t - HOURS * 3600) / 3600)
+    assert _analyze(history, now).freezer_rise_rate == pytest.approx(2.0)
+    assert "freezer_warming" in _analyze(history, now).anomalies
+    assert "freezer_warming" not in _analyze(history, now, door_open=True).anomalies
+
+
+def test_sine_cycle_period() -> None:
+    period = 40 * 60
+    history, now = _history(lambda t: SETPOINT + math.sin(2 * math.pi * t / period + 0.1))
+    state = _analyze(history, now)
+    assert state.freezer_cycle_period == pytest.approx(40, abs=1)
+    assert state.compressor_cycle_period == state.freezer_cycle_period
+
+
+def test_offset_deviation() -> None:
+    history, now = _history(lambda t: SETPOINT + 2)
+    state = _analyze(history, now)
+    assert state.freezer_deviation == pytest.approx(2.0)
+    assert "freezer_deviation" not in state.anomalies
+
+    history, now = _history(lambda t: SETPOINT + 4)
+    assert "freezer_deviation" in _analyze(history, now).anomalies
+
+
+def test_missing_compartment_has_no_results() -> None:
+    history, now = _history(lambda t: SETPOINT + 2 * (t - HOURS * 3600) / 3600)
+    state = _analyze(history, now)
+    assert state.fridge_rise_rate is None
+    assert state.fridge_cycle_period is None
+    assert state.fridge_deviation is None
+    assert not {anomaly for anomaly in state.anomalies if anomaly.startswith("fridge")}
+
+
+def test_devices_are_analysed_independently() -> None:
+    ramp, now = _history(lambda t: SETPOINT + 0.5 * t / 3600)
+    offset, _ = _history(lambda t: SETPOINT + 2)
+    states = analysis.analyze([ramp, offset, analysis.TemperatureHistory()], [False, False, False], now)
+    assert states[0].freezer_rise_rate == pytest.approx(0.5)
+    assert states[1].freezer_deviation == pytest.approx(2.0)
+    assert states[2] == analysis.ThermalState()
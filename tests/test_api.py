@@ -0,0 +1,187 @@
+"""Haier Evo cloud client."""
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+from custom_components.haier_evo_fridge.core import analysis, api, traffic
+from soak import SoakWebSocketApp
+
+from .conftest import MAC
+
+
+class RecordingWebSocketApp(SoakWebSocketApp):
+    """Keeps the (attribute, value) of every command sent."""
+
+    sent_commands: list[tuple[str, str]] = []
+
+    def send(self, payload: str, *args) -> None:
+        super().send(payload, *args)
+        command = json.loads(payload)["command"]
+        self.sent_commands.append((command["commandName"], command["value"]))
+
+
+def test_status_fetch_is_rate_limited(tmp_path, cloud) -> None:
+    """Status fetches share the account's rate limited request path."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        with mock.patch.object(api.Haier, "make_request", side_effect=cloud.request) as make_request:
+            device = api.HaierFridge(haier, MAC, "SOAK0", "Fridge")
+        make_request.assert_called_once()
+        assert make_request.call_args.args[:2] == ("GET", api.C.API_STATUS.replace("{mac}", MAC))
+        assert device.model_name == "BCF3261WRU"
+    finally:
+        haier.close()
+
+
+def test_unchanged_status_notifies_no_listener(tmp_path, cloud) -> None:
+    """Only a status that changed an attribute wakes the entities."""
+    with mock.patch.object(api.C, "REQUEST_CACHE_TTL", 0):
+        haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        device = api.HaierFridge(haier, MAC, "SOAK0", "Fridge")
+        notified = []
+        device.add_listener(lambda: notified.append(device.freezer_temperature))
+        assert not device.poll_status()
+        assert not device.poll_status()
+        assert notified == []
+
+        status = cloud.request
+
+        def warmer(method: str, url: str, **kwargs):
+            data = status(method, url, **kwargs).json()
+            for attribute in data["attributes"]:
+                if attribute["name"] == api.C.ATTR_FREEZER_TEMP:
+                    attribute["currentValue"] = "-12"
+            return cloud._response(data)
+
+        with mock.patch.object(api.requests, "request", warmer):
+            assert device.poll_status()
+        assert notified == [-12.0]
+    finally:
+        haier.close()
+
+
+def test_unchanged_analysis_notifies_no_listener(tmp_path, cloud) -> None:
+    """Repeating the last thermal analysis result does not wake the entities."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        device = api.HaierFridge(haier, MAC, "SOAK0", "Fridge")
+        notified = []
+        device.add_listener(lambda: notified.append(device.thermal))
+        state = analysis.ThermalState(freezer_rise_rate=0.5)
+        device.set_thermal(state)
+        device.set_thermal(analysis.ThermalState(freezer_rise_rate=0.5))
+        device.set_thermal(analysis.ThermalState())
+        assert notified == [state, analysis.ThermalState()]
+    finally:
+        haier.close()
+
+
+def _queue(haier: api.Haier, attribute: str, value: str) -> None:
+    payload = json.dumps({"action": "command", "command": {"commandName": attribute, "value": value}})
+    haier.send_commands(MAC, [(attribute, f"{attribute}={value}", payload)])
+
+
+def _replay(haier: api.Haier) -> list[tuple[str, str]]:
+    RecordingWebSocketApp.sent_commands = []
+    with mock.patch.object(api, "WebSocketApp", RecordingWebSocketApp):
+        haier.connect_in_thread()
+        assert haier.wait_connected(5)
+    return RecordingWebSocketApp.sent_commands
+
+
+def test_queued_commands_replay_in_order(tmp_path, cloud) -> None:
+    """Commands queued while the socket is down are sent in order once it opens, the newest value per attribute."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        _queue(haier, api.C.ATTR_VACATION_MODE, "1")
+        _queue(haier, api.C.ATTR_SUPER_COOL, "1")
+        _queue(haier, api.C.ATTR_VACATION_MODE, "0")
+        assert _replay(haier) == [(api.C.ATTR_SUPER_COOL, "1"), (api.C.ATTR_VACATION_MODE, "0")]
+    finally:
+        haier.close()
+
+
+def test_expired_commands_are_dropped(tmp_path, cloud) -> None:
+    """Commands queued longer than COMMAND_QUEUE_TTL are not replayed."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        _queue(haier, api.C.ATTR_VACATION_MODE, "1")
+        queued_at, payload, trace = haier._command_queues[MAC][api.C.ATTR_VACATION_MODE]
+        haier._command_queues[MAC][api.C.ATTR_VACATION_MODE] = (queued_at - api.C.COMMAND_QUEUE_TTL - 1, payload, trace)
+        _queue(haier, api.C.ATTR_SUPER_COOL, "1")
+        assert _replay(haier) == [(api.C.ATTR_SUPER_COOL, "1")]
+    finally:
+        haier.close()
+
+
+def test_command_sent_while_opening_is_not_overtaken(tmp_path, cloud) -> None:
+    """A value set while the socket opens is not overwritten by the replay of an older queued one."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    stop_polling = haier._stop_polling
+
+    def set_while_opening() -> None:
+        # the socket stops polling while it opens, just before the replay
+        stop_polling()
+        if not haier.wait_connected(0):
+            _queue(haier, api.C.ATTR_VACATION_MODE, "0")
+
+    try:
+        _queue(haier, api.C.ATTR_VACATION_MODE, "1")
+        with mock.patch.object(haier, "_stop_polling", set_while_opening):
+            sent = _replay(haier)
+        assert sent[-1] == (api.C.ATTR_VACATION_MODE, "0")
+    finally:
+        haier.close()
+
+
+def test_frames_of_unknown_devices_share_one_counter(tmp_path, cloud) -> None:
+    """Frames for macs without a device are counted together, not per mac."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        haier._add_device(MAC, "SOAK0", "Fridge")
+        for mac in (MAC, "00:00:00:00:00:02", "00:00:00:00:00:03"):
+            haier._on_message(None, json.dumps({"event": "info", "macAddress": mac}))
+        counters = haier.traffic.snapshot()
+        assert set(counters) == {MAC, traffic.UNKNOWN_DEVICE}
+        assert counters[traffic.UNKNOWN_DEVICE]["in_frames"] == 2
+    finally:
+        haier.close()
+
+
+def _discover(tmp_path, cloud, partitions: dict[int, list[str]]) -> tuple[list[str], list[int]]:
+    """Macs discovered in `partitions` and the partitions requested, every request rate limited."""
+    cloud.partitions = partitions
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        with mock.patch.object(api.Haier, "make_request", side_effect=cloud.request) as make_request:
+            haier.pull_data(connect=False)
+        assert make_request.call_count == cloud.calls
+        parts = sorted(
+            int(call.args[1].split("part=")[1].split("&")[0])
+            for call in make_request.call_args_list if "smartHome" in call.args[1]
+        )
+        return sorted(device.device_mac for device in haier.devices), parts
+    finally:
+        haier.close()
+
+
+def test_discovery_reads_every_partition(tmp_path, cloud) -> None:
+    macs = ["00:00:00:00:00:01", "00:00:00:00:00:02", "00:00:00:00:00:03"]
+    discovered, parts = _discover(tmp_path, cloud, {1: macs[:1], 2: macs[1:2], 3: macs[2:]})
+    assert discovered == macs
+    assert parts == [1, 2, 3, 4]
+
+
+def test_discovery_adds_a_device_listed_twice_once(tmp_path, cloud) -> None:
+    macs = ["00:00:00:00:00:01", "00:00:00:00:00:02"]
+    discovered, _ = _discover(tmp_path, cloud, {1: macs, 2: macs[1:], 3: macs[1:]})
+    assert discovered == macs
+
+
+def test_discovery_stops_at_an_empty_partition(tmp_path, cloud) -> None:
+    """Single partition accounts need one wave, partitions after an empty one are not read."""
+    discovered, parts = _discover(tmp_path, cloud, {1: [MAC], 3: ["00:00:00:00:00:02"]})
+    assert discovered == [MAC]
+    assert parts == list(range(1, api.C.API_DEVICES_PARTS + 1))
@@ -0,0 +1,37 @@
+"""Acknowledgement tracking of command batches."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from custom_components.haier_evo_fridge.core.commands import CommandBatch
+
+
+def test_done_once_every_trace_was_acked() -> None:
+    batch = CommandBatch(["a", "b"])
+    batch.ack("a")
+    assert not batch.done
+    batch.ack("b")
+    assert batch.done
+    assert batch.wait(0)
+    assert CommandBatch([]).done
+
+
+async def test_async_wait_is_woken_from_another_thread() -> None:
+    batch = CommandBatch(["a"])
+    threads = threading.active_count()
+    waiter = asyncio.ensure_future(batch.async_wait(5))
+    await asyncio.sleep(0)
+    # no worker thread waits for the acknowledgement
+    assert threading.active_count() == threads
+    threading.Timer(0.05, batch.ack, ("a",)).start()
+    assert await waiter
+    assert await batch.async_wait(0)
+
+
+async def test_async_wait_timeout() -> None:
+    batch = CommandBatch(["a"])
+    assert not await batch.async_wait(0.05)
+    # a late acknowledgement does not call the abandoned waiter
+    batch.ack("a")
+    assert batch.done
@@ -0,0 +1,66 @@
+"""Config flow of Haier Evo Fridge."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urljoin
+
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.haier_evo_fridge.config_flow import validate_input
+from custom_components.haier_evo_fridge.const import DATA_HANDOFF, DOMAIN, HANDOFF_TIMEOUT
+from custom_components.haier_evo_fridge.core import api
+
+USER_INPUT = {"email": "soak@example.com", "password": "password"}
+
+
+async def test_no_devices(hass: HomeAssistant, cloud) -> None:
+    """An account without devices is reported instead of creating an empty entry."""
+    cloud.macs = []
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+    assert not hass.config_entries.async_entries(DOMAIN)
+
+
+
+async def test_entry_takes_over_flow_connection(hass: HomeAssistant, cloud) -> None:
+    """The created entry reuses the flow's login and discovery instead of repeating them."""
+    urls = []
+    request = cloud.request
+
+    def recording(method: str, url: str, **kwargs):
+        urls.append(url)
+        return request(method, url, **kwargs)
+
+    with mock.patch.object(api.requests, "request", recording):
+        result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], USER_INPUT)
+        await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].state is ConfigEntryState.LOADED
+    assert [url for url in urls if url.endswith(api.C.API_LOGIN)] == [urljoin(api.C.API_PATH, api.C.API_LOGIN)]
+    assert len([url for url in urls if "smartHome" in url]) == api.C.API_DEVICES_PARTS
+    assert not hass.data[DATA_HANDOFF]
+    await hass.config_entries.async_unload(result["result"].entry_id)
+
+
+async def test_unused_flow_connection_is_closed(hass: HomeAssistant, cloud) -> None:
+    """A connection no entry took over is closed once HANDOFF_TIMEOUT passed."""
+    await validate_input(hass, USER_INPUT)
+    haier, _ = hass.data[DATA_HANDOFF][api.account_id(USER_INPUT["email"])]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=HANDOFF_TIMEOUT - 1))
+    await hass.async_block_till_done()
+    assert not haier._disconnect_requested
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=HANDOFF_TIMEOUT + 1))
+    await hass.async_block_till_done()
+    assert not hass.data[DATA_HANDOFF]
+    assert haier._disconnect_requested
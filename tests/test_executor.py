@@ -0,0 +1,50 @@
+"""Bounded worker pool for blocking I/O."""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from custom_components.haier_evo_fridge.core.executor import HaierExecutor
+
+
+def test_stats_count_queued_jobs_and_their_wait() -> None:
+    executor = HaierExecutor(max_workers=1)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait, 5)
+        queued = [executor.submit(lambda i=i: i) for i in range(2)]
+        assert executor.stats["queued"] == 2
+        threading.Timer(0.1, release.set).start()
+        assert [future.result(5) for future in queued] == [0, 1]
+        assert running.result(5)
+        stats = executor.stats
+        assert stats["queued"] == 0
+        assert stats["jobs"] == 3
+        assert stats["max_wait"] >= 0.1
+        assert 0 < stats["average_wait"] <= stats["max_wait"]
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_shutdown_cancels_queued_jobs() -> None:
+    executor = HaierExecutor(max_workers=1)
+    release = threading.Event()
+    running = executor.submit(release.wait, 5)
+    queued = executor.submit(lambda: None)
+    executor.shutdown()
+    with pytest.raises(CancelledError):
+        queued.result(5)
+    assert executor.stats["queued"] == 0
+    release.set()
+    assert running.result(5)
+
+
+def test_submit_after_shutdown_raises() -> None:
+    executor = HaierExecutor(max_workers=1)
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    assert executor.stats["queued"] == 0
@@ -0,0 +1,97 @@
+"""Entries of one account sharing a connection."""
+from __future__ import annotations
+
+import logging
+from unittest import mock
+
+from homeassistant.config_entries import ConfigEntryDisabler
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haier_evo_fridge.const import DATA_HUBS, DOMAIN
+
+ENTRY_DATA = {"email": "soak@example.com", "password": "password"}
+
+
+async def _setup_two_entries(hass: HomeAssistant) -> tuple[MockConfigEntry, MockConfigEntry]:
+    first = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    second = MockConfigEntry(domain=DOMAIN, data={**ENTRY_DATA, "email": " Soak@Example.com"})
+    for entry in (first, second):
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return first, second
+
+
+def _entity_entries(hass: HomeAssistant) -> dict[str, list[str]]:
+    """Registered unique ids by config entry."""
+    entries: dict[str, list[str]] = {}
+    for entity in er.async_get(hass).entities.values():
+        if entity.platform == DOMAIN:
+            entries.setdefault(entity.config_entry_id, []).append(entity.unique_id)
+    return entries
+
+
+async def test_entries_share_connection_and_entities(hass: HomeAssistant, cloud) -> None:
+    """A second entry of an account reuses the connection and creates no entity twice."""
+    handler = logging.Handler(logging.ERROR)
+    handler.emit = mock.Mock()
+    logging.getLogger().addHandler(handler)
+    try:
+        first, second = await _setup_two_entries(hass)
+    finally:
+        logging.getLogger().removeHandler(handler)
+    # platforms reject an entity registered twice with an error
+    assert not handler.emit.call_args_list
+    assert hass.data[DOMAIN][first.entry_id] is hass.data[DOMAIN][second.entry_id]
+    assert len(hass.data[DATA_HUBS]) == 1
+
+    entities = _entity_entries(hass)
+    assert list(entities) == [first.entry_id]
+    assert entities[first.entry_id]
+    assert len(set(entities[first.entry_id])) == len(entities[first.entry_id])
+
+    # reloading the owner keeps the entities in place
+    assert await hass.config_entries.async_reload(first.entry_id)
+    await hass.async_block_till_done()
+    assert list(_entity_entries(hass)) == [first.entry_id]
+
+
+async def test_removing_owner_moves_entities(hass: HomeAssistant, cloud) -> None:
+    """The remaining entry takes over the entities of a removed one."""
+    first, second = await _setup_two_entries(hass)
+    unique_ids = sorted(_entity_entries(hass)[first.entry_id])
+
+    await hass.config_entries.async_remove(first.entry_id)
+    await hass.async_block_till_done()
+    entities = _entity_entries(hass)
+    assert list(entities) == [second.entry_id]
+    assert sorted(entities[second.entry_id]) == unique_ids
+    assert len(hass.data[DATA_HUBS]) == 1
+    assert hass.states.get("sensor.freezer_temperature").state != STATE_UNAVAILABLE
+
+
+async def test_disabling_owner_moves_entities(hass: HomeAssistant, cloud) -> None:
+    """Entities of a disabled owner are created by the remaining entry, enabled."""
+    first, second = await _setup_two_entries(hass)
+
+    assert await hass.config_entries.async_set_disabled_by(first.entry_id, ConfigEntryDisabler.USER)
+    await hass.async_block_till_done()
+    registry = er.async_get(hass)
+    entities = [entity for entity in registry.entities.values() if entity.platform == DOMAIN]
+    assert {entity.config_entry_id for entity in entities} == {second.entry_id}
+    assert not [entity for entity in entities if entity.disabled_by is er.RegistryEntryDisabler.CONFIG_ENTRY]
+
+
+async def test_last_entry_closes_connection(hass: HomeAssistant, cloud) -> None:
+    """The connection stays until every entry of the account was unloaded."""
+    first, second = await _setup_two_entries(hass)
+    haier = hass.data[DOMAIN][first.entry_id]
+
+    assert await hass.config_entries.async_unload(first.entry_id)
+    assert hass.data[DATA_HUBS]
+    assert await hass.config_entries.async_unload(second.entry_id)
+    assert not hass.data[DATA_HUBS]
+    assert haier._disconnect_requested
@@ -0,0 +1,130 @@
+"""Setup, unload and reload of Haier Evo Fridge entries."""
+from __future__ import annotations
+
+import asyncio
+import gc
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.haier_evo_fridge.const import DATA_HUBS, DOMAIN
+from custom_components.haier_evo_fridge.core import api
+
+from .conftest import DownWebSocketApp
+
+ENTRY_DATA = {"email": "soak@example.com", "password": "password"}
+
+
+def _integration_threads() -> list[str]:
+    return [t.name for t in threading.enumerate() if t.name.startswith(DOMAIN)]
+
+
+async def _wait_threads_gone(timeout: float = 5) -> list[str]:
+    for _ in range(int(timeout / 0.1)):
+        if not _integration_threads():
+            break
+        await asyncio.sleep(0.1)
+    return _integration_threads()
+
+
+async def test_reload_releases_connection(hass: HomeAssistant, cloud) -> None:
+    """Reloading an entry closes the previous connection and leaves no threads behind."""
+    auth = api.Haier.auth
+
+    def slow_auth(self) -> None:
+        # unload while the socket thread is still authenticating
+        time.sleep(0.05)
+        auth(self)
+
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    with mock.patch.object(api.Haier, "auth", slow_auth):
+        await _reload_cycles(hass, entry)
+    assert await _wait_threads_gone() == []
+
+
+async def _reload_cycles(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+
+    for _ in range(5):
+        haier = hass.data[DOMAIN][entry.entry_id]
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        assert hass.data[DOMAIN][entry.entry_id] is not haier
+        assert len(hass.data[DATA_HUBS]) == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert not hass.data[DATA_HUBS]
+
+
+async def test_reload_while_polling(hass: HomeAssistant, cloud) -> None:
+    """A reload with the websocket down waits for the status poll in flight, memory stays flat."""
+    polling = threading.Event()
+    poll_status = api.HaierFridge.poll_status
+
+    def slow_poll_status(self) -> bool:
+        polling.set()
+        time.sleep(0.2)
+        return poll_status(self)
+
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    with mock.patch.object(api, "WebSocketApp", DownWebSocketApp), \
+            mock.patch.object(api.C, "RATE_LIMIT", 0.2), \
+            mock.patch.object(api.HaierFridge, "poll_status", slow_poll_status):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        tracemalloc.start()
+        try:
+            for cycle in range(8):
+                if cycle == 3:  # after warm-up
+                    gc.collect()
+                    before = tracemalloc.take_snapshot()
+                polling.clear()
+                assert await hass.async_add_executor_job(polling.wait, 5)
+                pollers = [t for t in threading.enumerate() if t.name == f"{DOMAIN}_poll"]
+                assert pollers
+                assert await hass.config_entries.async_reload(entry.entry_id)
+                await hass.async_block_till_done()
+                assert not [t for t in pollers if t.is_alive()]
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    assert await _wait_threads_gone() == []
+
+    own = [tracemalloc.Filter(True, "*/custom_components/haier_evo_fridge/*")]
+    growth = sum(stat.size_diff for stat in after.filter_traces(own).compare_to(before.filter_traces(own), "filename"))
+    assert growth < 64 * 1024
+
+
+async def test_entities_do_not_poll_while_pushed(hass: HomeAssistant, cloud) -> None:
+    """With the websocket up, entity scan intervals cost no REST calls."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    # no shared results, every status fetch would reach the cloud
+    with mock.patch.object(api.C, "REQUEST_CACHE_TTL", 0):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert await hass.async_add_executor_job(hass.data[DOMAIN][entry.entry_id].wait_connected, 5)
+    calls = cloud.calls
+    for minutes in range(1, 5):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=minutes))
+        await hass.async_block_till_done()
+    assert cloud.calls == calls
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,63 @@
+"""Rate limiting of repeated log messages."""
+from __future__ import annotations
+
+import logging
+from unittest import mock
+
+import pytest
+
+from custom_components.haier_evo_fridge.core import logger
+from custom_components.haier_evo_fridge.core.logger import RateLimitFilter
+
+
+class _Records(logging.Handler):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def log():
+    """Logger limited to two records per message and minute on a patched clock."""
+    log = logging.getLogger("tests.haier_evo_fridge.rate_limit")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    records = _Records()
+    log.addHandler(records)
+    rate_limit = RateLimitFilter(burst=2, period=60)
+    log.addFilter(rate_limit)
+    clock = mock.Mock(return_value=1000.0)
+    with mock.patch.object(logger.time, "monotonic", clock):
+        yield log, records.messages, clock
+    log.removeFilter(rate_limit)
+    log.removeHandler(records)
+
+
+def test_repeats_beyond_burst_are_suppressed(log) -> None:
+    log, messages, _ = log
+    for i in range(5):
+        log.warning("Device %s offline", i)
+    log.error("Device %s offline", 5)
+    log.warning("Socket closed")
+    assert messages == ["Device 0 offline", "Device 1 offline", "Device 5 offline", "Socket closed"]
+
+
+def test_next_window_reports_suppressed_count(log) -> None:
+    log, messages, clock = log
+    for i in range(5):
+        log.warning("Device %s offline", i)
+    clock.return_value += 60
+    log.warning("Device %s offline", 5)
+    log.warning("Device %s offline", 6)
+    assert messages[2:] == ["Device 5 offline (3 similar messages suppressed)", "Device 6 offline"]
+
+
+def test_debug_is_never_suppressed(log) -> None:
+    log, messages, _ = log
+    for i in range(5):
+        log.debug("Frame %s", i)
+    assert len(messages) == 5
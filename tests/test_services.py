@@ -0,0 +1,79 @@
+"""Services of Haier Evo Fridge."""
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haier_evo_fridge import const as C
+from custom_components.haier_evo_fridge.core import api
+from soak import SoakWebSocketApp
+
+from .conftest import MAC, DownWebSocketApp
+
+ENTRY_DATA = {"email": "soak@example.com", "password": "password"}
+
+
+class AckingWebSocketApp(SoakWebSocketApp):
+    """Answers every command like the device does."""
+
+    def send(self, payload: str, *args) -> None:
+        super().send(payload, *args)
+        message = json.loads(payload)
+        self.push(json.dumps({"event": "command_response", "macAddress": MAC, "trace": message["trace"]}))
+
+
+async def _set_attributes(hass: HomeAssistant, connected: bool = True) -> dict:
+    entry = MockConfigEntry(domain=C.DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    haier = hass.data[C.DOMAIN][entry.entry_id]
+    assert await hass.async_add_executor_job(haier.wait_connected, 5 if connected else 0.1) is connected
+    device = dr.async_get(hass).async_get_device(identifiers={(C.DOMAIN, haier.devices[0].unique_id)})
+    try:
+        return await hass.services.async_call(
+            C.DOMAIN, C.SERVICE_SET_ATTRIBUTES,
+            {"device_id": device.id, "attributes": {"vacation_mode": True, "super_cool_mode": True}},
+            blocking=True,
+            return_response=True,
+        )
+    finally:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_set_attributes_waits_for_ack(hass: HomeAssistant, cloud) -> None:
+    """The service returns once the device confirmed the commands."""
+    with mock.patch.object(api, "WebSocketApp", AckingWebSocketApp):
+        assert await _set_attributes(hass) == {"status": "confirmed"}
+
+
+async def test_set_attributes_ack_timeout(hass: HomeAssistant, cloud) -> None:
+    """The service fails when the device does not confirm the commands."""
+    with mock.patch.object(C, "COMMAND_ACK_TIMEOUT", 0.2), pytest.raises(HomeAssistantError):
+        await _set_attributes(hass)
+
+
+async def test_set_attributes_queued(hass: HomeAssistant, cloud) -> None:
+    """While the websocket is down the service reports the commands as queued right away."""
+    with mock.patch.object(api, "WebSocketApp", DownWebSocketApp):
+        assert await _set_attributes(hass, connected=False) == {"status": "queued"}
+
+
+def test_superseded_command_is_acked(tmp_path) -> None:
+    """A queued command replaced by a newer one settles its batch."""
+    haier = api.Haier("soak@example.com", "password", str(tmp_path))
+    try:
+        first = haier.send_commands(MAC, [("8", "trace-1", "{}")])
+        second = haier.send_commands(MAC, [("8", "trace-2", "{}")])
+        assert first.done
+        assert not second.done
+        assert "trace-1" not in haier._pending_acks
+    finally:
+        haier.close()
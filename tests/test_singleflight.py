@@ -0,0 +1,106 @@
+"""Deduplication of concurrent blocking calls."""
+from __future__ import annotations
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from custom_components.haier_evo_fridge.core import singleflight
+from custom_components.haier_evo_fridge.core.singleflight import SingleFlight
+
+
+class _Blocking(object):
+    """Call blocking until released, counting how often it ran."""
+
+    def __init__(self, result=None, error: BaseException | None = None) -> None:
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._result = result
+        self._error = error
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def _run_concurrently(flight: SingleFlight, fn: _Blocking, callers: int = 4) -> list:
+    """Outcomes of `callers` threads calling while the first one's call is in flight."""
+    outcomes = [None] * callers
+
+    def caller(i: int) -> None:
+        try:
+            outcomes[i] = flight.do("key", fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    threads[0].start()
+    assert fn.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  # let the followers reach the wait
+    fn.release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_callers_share_one_call() -> None:
+    fn = _Blocking(result=object())
+    assert _run_concurrently(SingleFlight(ttl=60), fn) == [fn._result] * 4
+    assert fn.calls == 1
+
+
+def test_error_reaches_every_waiter_and_is_not_kept() -> None:
+    error = RuntimeError("cloud down")
+    fn = _Blocking(error=error)
+    flight = SingleFlight(ttl=60)
+    assert _run_concurrently(flight, fn) == [error] * 4
+    assert fn.calls == 1
+    with pytest.raises(RuntimeError):
+        flight.do("key", fn)
+    assert fn.calls == 2
+
+
+def test_result_expires_after_ttl() -> None:
+    now = 1000.0
+    flight = SingleFlight(ttl=2)
+    fn = mock.Mock(side_effect=lambda: fn.call_count)
+    with mock.patch.object(singleflight.time, "monotonic", lambda: now):
+        assert flight.do("key", fn) == 1
+        now += 1.9
+        assert flight.do("key", fn) == 1
+        assert flight.do("other", fn) == 2
+        now += 0.1
+        assert flight.do("key", fn) == 3
+
+
+def test_forget_drops_a_completed_call_only() -> None:
+    flight = SingleFlight(ttl=60)
+    assert flight.do("key", lambda: 1) == 1
+    flight.forget("key")
+    assert flight.do("key", lambda: 2) == 2
+
+    fn = _Blocking(result=3)
+    leader = threading.Thread(target=flight.do, args=("key", fn))
+    flight.forget("key")
+    leader.start()
+    assert fn.started.wait(5)
+    # forgetting an in-flight call would let a second one go out
+    flight.forget("key")
+    follower = []
+    thread = threading.Thread(target=lambda: follower.append(flight.do("key", fn)))
+    thread.start()
+    time.sleep(0.1)
+    fn.release.set()
+    for t in (leader, thread):
+        t.join(5)
+    assert follower == [3]
+    assert fn.calls == 1